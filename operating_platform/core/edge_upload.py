@@ -13,20 +13,31 @@ This is CLOUD=2 mode - faster than direct cloud upload because:
 Usage:
     from operating_platform.core.edge_upload import EdgeUploader
 
-    uploader = EdgeUploader()
-    if uploader.test_connection():
-        uploader.sync_dataset("/path/to/dataset", "repo_id")
-        uploader.trigger_training("repo_id")
+    with EdgeUploader() as uploader:
+        if uploader.test_connection():
+            uploader.sync_dataset("/path/to/dataset", "repo_id")
+            uploader.trigger_training("repo_id")
 
 Supports both SSH key and password authentication (password via paramiko).
 """
 
+import hashlib
+import json
 import os
+import queue
+import re
+import selectors
+import shlex
+import shutil
 import subprocess
+import tempfile
 import logging
 import time
 import threading
+import uuid
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional, Callable
@@ -50,6 +61,42 @@ DEFAULT_EDGE_API_URL = os.environ.get("API_BASE_URL", os.environ.get("EDGE_API_U
 DEFAULT_API_USERNAME = os.environ.get("API_USERNAME", "default")
 # API password for cloud training authentication (passed to edge server for cloud upload)
 DEFAULT_API_PASSWORD = os.environ.get("API_PASSWORD", "")
+# rsync compression costs more CPU than it saves on a LAN link; opt-in only
+DEFAULT_RSYNC_COMPRESS = os.environ.get("EDGE_RSYNC_COMPRESS", "0") == "1"
+# Print rsync transfer statistics after each sync (for diagnosing slow uploads)
+DEFAULT_RSYNC_STATS = os.environ.get("EDGE_RSYNC_STATS", "0") == "1"
+# Number of concurrent rsync processes used for direct (non-tar) sync
+DEFAULT_RSYNC_PARALLEL = int(os.environ.get("EDGE_RSYNC_PARALLEL", "4"))
+# Optional rsync bandwidth cap in KB/s, so uploads don't starve robot traffic on a shared NIC
+DEFAULT_RSYNC_BWLIMIT = int(os.environ["EDGE_RSYNC_BWLIMIT"]) if os.environ.get("EDGE_RSYNC_BWLIMIT") else None
+# Optional rsync --partial-dir (relative to each destination dir) for interrupted transfers
+DEFAULT_RSYNC_PARTIAL_DIR = os.environ.get("EDGE_RSYNC_PARTIAL_DIR") or None
+# Stream datasets as tar over the edge HTTP API instead of SSH (edge must expose /edge/upload)
+DEFAULT_HTTP_UPLOAD = os.environ.get("EDGE_HTTP_UPLOAD", "0") == "1"
+
+# How many directory levels below each top-level dataset dir to split into rsync
+# shards, following the dataset layout: images/<key>/..., videos/chunk-XXX/<key>/...
+# and audio/chunk-XXX/<key>/...; other top-level dirs are one shard each
+_RSYNC_SHARD_DEPTH = {"images": 1, "videos": 2, "audio": 2}
+
+# Records which rsync shards of a dataset reached the edge server, for resuming.
+# Kept outside the dataset (one file per dataset path) so no transfer mode uploads it
+UPLOAD_MANIFEST_DIR = Path.home() / ".dorobot" / "upload_manifests"
+
+# rsync progress records end with "\r" (in-place update) or "\n"
+_RECORD_SEP_RE = re.compile(rb"[\r\n]")
+# Matched against raw rsync output records, so nothing is decoded unless shown
+_PROGRESS_RE = re.compile(rb"(\d+)\s*%")
+_SUMMARY_RE = re.compile(rb"\b(sent|total)\b", re.IGNORECASE)
+
+# Resolve binaries once so each spawn skips the PATH search
+_SSH_BIN = shutil.which("ssh")
+_RSYNC_BIN = shutil.which("rsync")
+for _name, _path in (("ssh", _SSH_BIN), ("rsync", _RSYNC_BIN)):
+    if _path is None:
+        logging.warning(f"[EdgeUpload] '{_name}' not found in PATH - key-based edge upload will fail")
+_SSH_BIN = _SSH_BIN or "ssh"
+_RSYNC_BIN = _RSYNC_BIN or "rsync"
 
 
 def log(message: str):
@@ -119,6 +166,17 @@ class EdgeConfig:
     api_username: str = DEFAULT_API_USERNAME  # API username for path isolation
     api_password: str = DEFAULT_API_PASSWORD  # API password for cloud training auth
     ssh_key: Optional[str] = None  # Path to SSH private key (alternative to password)
+    compress: bool = DEFAULT_RSYNC_COMPRESS  # rsync compression (off by default on LAN)
+    rsync_stats: bool = DEFAULT_RSYNC_STATS  # Append --stats to rsync for diagnostics
+    rsync_parallel: int = DEFAULT_RSYNC_PARALLEL  # Concurrent rsync shards in direct mode
+    bwlimit_kbps: Optional[int] = DEFAULT_RSYNC_BWLIMIT  # rsync --bwlimit (KB/s)
+    partial_dir: Optional[str] = DEFAULT_RSYNC_PARTIAL_DIR  # rsync --partial-dir (replaces --inplace)
+    use_http_upload: bool = DEFAULT_HTTP_UPLOAD  # Tar stream over HTTP API instead of SSH
+
+    def __post_init__(self):
+        # rsync's bandwidth limiting is badly skewed by on-the-fly compression
+        if self.compress and self.bwlimit_kbps:
+            raise ValueError("EdgeConfig: compress and bwlimit_kbps cannot be combined")
 
     @classmethod
     def from_env(cls) -> "EdgeConfig":
@@ -133,6 +191,12 @@ class EdgeConfig:
             api_username=os.environ.get("API_USERNAME", DEFAULT_API_USERNAME),
             api_password=os.environ.get("API_PASSWORD", DEFAULT_API_PASSWORD),
             ssh_key=os.environ.get("EDGE_SERVER_KEY"),
+            compress=os.environ.get("EDGE_RSYNC_COMPRESS", "0") == "1",
+            rsync_stats=os.environ.get("EDGE_RSYNC_STATS", "0") == "1",
+            rsync_parallel=int(os.environ.get("EDGE_RSYNC_PARALLEL", str(DEFAULT_RSYNC_PARALLEL))),
+            bwlimit_kbps=int(os.environ["EDGE_RSYNC_BWLIMIT"]) if os.environ.get("EDGE_RSYNC_BWLIMIT") else None,
+            partial_dir=os.environ.get("EDGE_RSYNC_PARTIAL_DIR") or None,
+            use_http_upload=os.environ.get("EDGE_HTTP_UPLOAD", "0") == "1",
         )
 
     def get_upload_path(self, repo_id: str) -> str:
@@ -160,6 +224,38 @@ class EdgeUploader:
         self._connected = False
         self._ssh_client: Optional["paramiko.SSHClient"] = None
         self._sftp: Optional["paramiko.SFTPClient"] = None
+        # SSH ControlMaster socket shared by all ssh/rsync calls of this uploader,
+        # so only the first call pays for the TCP + key exchange + auth handshake.
+        # Random per uploader, so a master left behind by another uploader (maybe
+        # for another host or user) is never picked up
+        self._cm_path = f"/tmp/dorobot-cm-{uuid.uuid4().hex}"
+        # Edge host keys are pinned in a dedicated known_hosts on first contact
+        # (accept-new) rather than ignored, so later connections are verified
+        self._known_hosts = Path.home() / ".dorobot" / "known_hosts"
+        self._known_hosts.parent.mkdir(parents=True, exist_ok=True)
+
+        # SSH options never change for the lifetime of an uploader, so resolve
+        # the key path and build the option list once instead of per command
+        key_path = os.path.expanduser(self.config.ssh_key) if self.config.ssh_key else None
+        self._ssh_key_arg = ("-i", key_path) if key_path and os.path.exists(key_path) else ()
+        self._ssh_base_opts = (
+            "-p", str(self.config.port),
+            "-o", "StrictHostKeyChecking=accept-new",
+            "-o", f"UserKnownHostsFile={self._known_hosts}",
+            "-o", "BatchMode=yes",
+            "-o", "ConnectTimeout=10",
+            # Reuse one authenticated connection across calls
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self._cm_path}",
+            "-o", "ControlPersist=60s",
+        )
+        self._userhost = f"{self.config.user}@{self.config.host}"
+        # Remote shell for rsync -e
+        self._ssh_opts_str = " ".join([_SSH_BIN, *self._ssh_base_opts, *self._ssh_key_arg])
+
+        # Keep-alive HTTP session so API calls reuse pooled connections
+        self._http = requests.Session()
+        self._http.mount(self.config.api_url, HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
     def _use_paramiko(self) -> bool:
         """Check if we should use paramiko (password auth) or rsync (key auth)"""
@@ -215,6 +311,12 @@ class EdgeUploader:
         exit_code = stdout.channel.recv_exit_status()
         return exit_code, stdout.read().decode(), stderr.read().decode()
 
+    def __enter__(self) -> "EdgeUploader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def close(self):
         """Close SSH/SFTP connections"""
         if self._sftp:
@@ -231,15 +333,39 @@ class EdgeUploader:
                 pass
             self._ssh_client = None
 
+        self._http.close()
+
+        # Tear down the multiplexed SSH master connection, if one was started
+        if os.path.exists(self._cm_path):
+            try:
+                subprocess.run(
+                    [
+                        _SSH_BIN, "-O", "exit",
+                        "-o", f"ControlPath={self._cm_path}",
+                        "-p", str(self.config.port),
+                        self._userhost,
+                    ],
+                    capture_output=True,
+                    timeout=10,
+                )
+            except Exception:
+                pass
+
     def test_connection(self, quick_test: bool = False) -> bool:
         """
         Test SSH connection to edge server.
 
+        In HTTP upload mode only the edge API is used, so the API is checked
+        instead and no SSH access is needed.
+
         Args:
             quick_test: If True, use shorter timeouts (5s) for startup checks.
                        If False, use normal timeouts for actual operations.
         """
         timeout = 5 if quick_test else 30
+        if self.config.use_http_upload:
+            return self._test_api_connection(timeout)
+
         log(f"Testing connection to {self.config.user}@{self.config.host}:{self.config.port} (timeout={timeout}s)...")
 
         # Use paramiko if password is set
@@ -303,56 +429,73 @@ class EdgeUploader:
             log(f"SSH connection error: {e}")
             return False
 
-    def _build_ssh_cmd(self, remote_cmd: list[str]) -> list[str]:
-        """Build SSH command with proper options"""
-        cmd = ["ssh"]
-
-        # Add SSH key if specified
-        if self.config.ssh_key:
-            key_path = os.path.expanduser(self.config.ssh_key)
-            if os.path.exists(key_path):
-                cmd.extend(["-i", key_path])
-
-        # Add port
-        cmd.extend(["-p", str(self.config.port)])
+    def _test_api_connection(self, timeout: float) -> bool:
+        """Check that the edge HTTP API answers"""
+        log(f"Testing edge API at {self.config.api_url} (timeout={timeout}s)...")
+        try:
+            response = self._http.get(f"{self.config.api_url}/health", timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            log(f"Edge API connection error: {e}")
+            return False
 
-        # Add options for non-interactive use
-        cmd.extend([
-            "-o", "StrictHostKeyChecking=no",
-            "-o", "UserKnownHostsFile=/dev/null",
-            "-o", "BatchMode=yes",
-            "-o", "ConnectTimeout=10",
-        ])
+        if response.status_code >= 500:
+            log(f"Edge API unhealthy: {response.status_code} - {response.text}")
+            return False
+        log("Edge API connection successful")
+        self._connected = True
+        return True
 
-        # Add user@host
-        cmd.append(f"{self.config.user}@{self.config.host}")
+    def _build_ssh_cmd(self, remote_cmd: list[str]) -> list[str]:
+        """Build SSH command with proper options"""
+        return [_SSH_BIN, *self._ssh_key_arg, *self._ssh_base_opts, self._userhost, *remote_cmd]
 
-        # Add remote command
-        cmd.extend(remote_cmd)
+    def _build_ssh_shell_cmd(self, script: str) -> list[str]:
+        """Build SSH command running a shell script remotely"""
+        # ssh joins the remote argv with spaces for the login shell, so the script
+        # must reach `sh -c` as one quoted word, not as separate arguments
+        return self._build_ssh_cmd(["sh", "-c", shlex.quote(script)])
 
-        return cmd
+    def _rsync_transfer_flags(self) -> list[str]:
+        """
+        rsync flags tuned for LAN transfer.
 
-    def _build_rsync_cmd(self, local_path: str, remote_subpath: str = "") -> list[str]:
+        Compression and the delta algorithm are both CPU-bound and slower than
+        a gigabit link, so files are sent whole (-W) and uncompressed unless
+        compression is explicitly enabled.
+        """
+        # stats1 keeps the closing "sent ... / total size ..." summary that -v used to print
+        flags = ["-a", "--info=progress2,stats1", "-W"]
+        # rsync refuses --partial-dir together with --inplace
+        if self.config.partial_dir:
+            flags.append(f"--partial-dir={self.config.partial_dir}")
+        else:
+            flags.append("--inplace")
+        if self.config.bwlimit_kbps:
+            flags.append(f"--bwlimit={self.config.bwlimit_kbps}")
+        if self.config.compress:
+            flags.append("--compress-level=2")
+        if self.config.rsync_stats:
+            flags.append("--stats")
+        return flags
+
+    def _build_rsync_cmd(
+        self,
+        local_path: str,
+        remote_subpath: str = "",
+        extra_args: Optional[list[str]] = None,
+    ) -> list[str]:
         """Build rsync command"""
         cmd = [
-            "rsync",
-            "-avz",  # archive, verbose, compress
-            "--progress",
+            _RSYNC_BIN,
+            *self._rsync_transfer_flags(),
             "--partial",  # Keep partial files for resume
             "--delete",  # Delete files on dest that don't exist on source
         ]
+        if extra_args:
+            cmd.extend(extra_args)
 
         # Add SSH options
-        ssh_opts = f"ssh -p {self.config.port}"
-        ssh_opts += " -o StrictHostKeyChecking=no"
-        ssh_opts += " -o UserKnownHostsFile=/dev/null"
-
-        if self.config.ssh_key:
-            key_path = os.path.expanduser(self.config.ssh_key)
-            if os.path.exists(key_path):
-                ssh_opts += f" -i {key_path}"
-
-        cmd.extend(["-e", ssh_opts])
+        cmd.extend(["-e", self._ssh_opts_str])
 
         # Source path (ensure trailing slash for directory contents)
         local_path = str(local_path).rstrip("/") + "/"
@@ -362,7 +505,7 @@ class EdgeUploader:
         remote_path = self.config.remote_path
         if remote_subpath:
             remote_path = f"{remote_path}/{remote_subpath}"
-        dest = f"{self.config.user}@{self.config.host}:{remote_path}/"
+        dest = f"{self._userhost}:{remote_path}/"
         cmd.append(dest)
 
         return cmd
@@ -387,8 +530,6 @@ class EdgeUploader:
         Returns:
             Path to created tar file, or None if failed
         """
-        import shutil
-
         local_path = Path(local_path)
         if not local_path.exists():
             log(f"Dataset path not found: {local_path}")
@@ -444,6 +585,97 @@ class EdgeUploader:
             log(f"Tar creation error: {e}")
             return None
 
+    def upload_tar_stream(
+        self,
+        local_path: str,
+        repo_id: str,
+        progress_callback: Optional[Callable[[str], None]] = None,
+    ) -> bool:
+        """
+        Stream the dataset as a tar archive to the edge HTTP API.
+
+        The archive is produced by tar on the fly and sent as the body of
+        POST {api_url}/edge/upload/{repo_id}; the edge server extracts it into
+        {remote_path}/{api_username}/{repo_id}/ on receipt. Nothing is staged
+        on local disk and datasets of many small files go over one connection.
+
+        Args:
+            local_path: Path to dataset directory
+            repo_id: Dataset repository ID
+            progress_callback: Optional callback for progress updates
+
+        Returns:
+            True if upload successful
+        """
+        local_path = Path(local_path)
+        if not local_path.exists():
+            log(f"Dataset path not found: {local_path}")
+            return False
+
+        total_bytes = sum(f.stat().st_size for f in local_path.rglob("*") if f.is_file())
+        total_mb = total_bytes / (1024 * 1024)
+        log(f"Streaming {total_mb:.1f} MB to {self.config.api_url}/edge/upload/{repo_id}...")
+
+        start_time = time.time()
+        # tar's stderr goes to a file: nothing reads it while the upload runs, and
+        # a full stderr pipe would block tar (and with it the upload)
+        tar_stderr = tempfile.TemporaryFile()
+        tar_proc = subprocess.Popen(
+            ["tar", "-cf", "-", "-C", str(local_path), "."],
+            stdout=subprocess.PIPE,
+            stderr=tar_stderr,
+        )
+
+        def body():
+            sent = 0
+            last_percent = 0
+            while True:
+                chunk = tar_proc.stdout.read(1024 * 1024)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                percent = min(100, int(100 * sent / max(total_bytes, 1)))
+                if progress_callback and percent >= last_percent + 5:
+                    last_percent = percent
+                    speed_mbps = (sent / (1024 * 1024)) / max(time.time() - start_time, 0.1)
+                    progress_callback(f"{percent}% ({speed_mbps:.1f} MB/s)")
+                yield chunk
+
+        try:
+            response = self._http.post(
+                f"{self.config.api_url}/edge/upload/{repo_id}",
+                params={"username": self.config.api_username},
+                data=body(),
+                headers={"Content-Type": "application/x-tar"},
+                timeout=(10, 1800),
+            )
+        except Exception as e:
+            tar_proc.kill()
+            log(f"HTTP tar upload error: {e}")
+            return False
+        finally:
+            # Closing first lets tar exit (SIGPIPE) if the body was not read to the end
+            tar_proc.stdout.close()
+            tar_returncode = tar_proc.wait()
+            tar_stderr.seek(0)
+            tar_errors = tar_stderr.read().decode(errors="replace")
+            tar_stderr.close()
+
+        if tar_returncode != 0:
+            log(f"Tar stream failed: {tar_errors}")
+            return False
+
+        if response.status_code != 200:
+            log(f"Edge server error: {response.status_code} - {response.text}")
+            return False
+
+        elapsed = time.time() - start_time
+        speed_mbps = total_mb / max(elapsed, 0.1)
+        log(f"HTTP tar upload completed: {total_mb:.1f} MB in {elapsed:.1f}s ({speed_mbps:.1f} MB/s)")
+        if progress_callback:
+            progress_callback(f"Upload complete ({speed_mbps:.1f} MB/s)")
+        return True
+
     def _upload_tar_file(
         self,
         tar_path: str,
@@ -509,20 +741,11 @@ class EdgeUploader:
                 return False
         else:
             # Use rsync for single file
-            ssh_opts = f"ssh -p {self.config.port}"
-            ssh_opts += " -o StrictHostKeyChecking=no"
-            ssh_opts += " -o UserKnownHostsFile=/dev/null"
-
-            if self.config.ssh_key:
-                key_path = os.path.expanduser(self.config.ssh_key)
-                if os.path.exists(key_path):
-                    ssh_opts += f" -i {key_path}"
-
             cmd = [
-                "rsync", "-avz", "--progress",
-                "-e", ssh_opts,
+                _RSYNC_BIN, *self._rsync_transfer_flags(),
+                "-e", self._ssh_opts_str,
                 tar_path,
-                f"{self.config.user}@{self.config.host}:{remote_tar_path}"
+                f"{self._userhost}:{remote_tar_path}"
             ]
 
             try:
@@ -549,6 +772,62 @@ class EdgeUploader:
                 log(f"Rsync tar upload error: {e}")
                 return False
 
+    def prepare_remote(self, subpath: str = "") -> dict:
+        """
+        Check connectivity, create a directory and read its free space in one remote command.
+
+        Replaces a test_connection() + create_remote_directory() pair, saving an
+        SSH round-trip (and handshake, without a live ControlMaster) per upload.
+
+        Returns:
+            {"ok": bool, "free_kb": Optional[int]}
+        """
+        remote_path = self.config.remote_path
+        if subpath:
+            remote_path = f"{remote_path}/{subpath}"
+
+        log(f"Preparing remote directory: {remote_path}")
+        command = f"mkdir -p '{remote_path}' && df -Pk '{remote_path}' | tail -1 && echo SSH_OK"
+
+        try:
+            # Use paramiko if password is set
+            if self._use_paramiko():
+                exit_code, stdout, stderr = self._exec_remote_command(command)
+            else:
+                result = subprocess.run(
+                    self._build_ssh_shell_cmd(command),
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                )
+                exit_code, stdout, stderr = result.returncode, result.stdout, result.stderr
+        except subprocess.TimeoutExpired:
+            log("SSH connection timeout (30s)")
+            return {"ok": False, "free_kb": None}
+        except Exception as e:
+            log(f"Error preparing remote directory: {e}")
+            return {"ok": False, "free_kb": None}
+
+        if exit_code != 0 or "SSH_OK" not in stdout:
+            log(f"Failed to prepare remote directory: {stderr}")
+            return {"ok": False, "free_kb": None}
+
+        self._connected = True
+
+        # df -P line: Filesystem 1024-blocks Used Available Capacity Mounted-on
+        free_kb = None
+        lines = stdout.splitlines()
+        if len(lines) >= 2:
+            fields = lines[-2].split()
+            if len(fields) >= 4 and fields[3].isdigit():
+                free_kb = int(fields[3])
+
+        if free_kb is not None:
+            log(f"Remote directory ready ({free_kb / (1024 * 1024):.1f} GB free)")
+        else:
+            log("Remote directory ready")
+        return {"ok": True, "free_kb": free_kb}
+
     def create_remote_directory(self, subpath: str = "") -> bool:
         """Create directory on edge server"""
         remote_path = self.config.remote_path
@@ -593,6 +872,46 @@ class EdgeUploader:
             log(f"Error creating remote directory: {e}")
             return False
 
+    def create_remote_directory_batch(self, subpaths: list[str]) -> bool:
+        """Create several directories on edge server with a single remote command"""
+        remote_paths = [f"{self.config.remote_path}/{subpath}" for subpath in subpaths]
+
+        log(f"Creating {len(remote_paths)} remote directories")
+
+        # Use paramiko if password is set
+        if self._use_paramiko():
+            try:
+                quoted = " ".join(f"'{path}'" for path in remote_paths)
+                exit_code, stdout, stderr = self._exec_remote_command(f"mkdir -p {quoted}")
+                if exit_code == 0:
+                    return True
+                log(f"Failed to create directories: {stderr}")
+                return False
+            except Exception as e:
+                log(f"Error creating remote directories: {e}")
+                return False
+
+        # Fall back to subprocess SSH
+        ssh_cmd = self._build_ssh_cmd(["mkdir", "-p", *remote_paths])
+
+        try:
+            result = subprocess.run(
+                ssh_cmd,
+                capture_output=True,
+                text=True,
+                timeout=30,
+            )
+
+            if result.returncode == 0:
+                return True
+            else:
+                log(f"Failed to create directories: {result.stderr}")
+                return False
+
+        except Exception as e:
+            log(f"Error creating remote directories: {e}")
+            return False
+
     def clear_remote_directory(self, subpath: str = "") -> bool:
         """
         Clear (remove all contents of) a directory on edge server.
@@ -635,10 +954,9 @@ class EdgeUploader:
                 return False
 
         # Fall back to subprocess SSH
-        ssh_cmd = self._build_ssh_cmd([
-            "sh", "-c",
+        ssh_cmd = self._build_ssh_shell_cmd(
             f"rm -rf '{remote_path}'/* '{remote_path}'/.[!.]* 2>/dev/null; mkdir -p '{remote_path}'"
-        ])
+        )
 
         try:
             result = subprocess.run(
@@ -749,14 +1067,21 @@ class EdgeUploader:
         log(f"  Local: {local_path}")
         log(f"  Remote: {self.config.user}@{self.config.host}:{upload_path}/")
         log(f"  User: {self.config.api_username}")
-        log(f"  Mode: {'TAR (fast)' if use_tar else 'Direct SFTP/rsync'}")
+        if self.config.use_http_upload:
+            log("  Mode: HTTP tar stream")
+        else:
+            log(f"  Mode: {'TAR (fast)' if use_tar else 'Direct SFTP/rsync'}")
 
         start_time = time.time()
 
+        # HTTP MODE: Stream tar through the edge API, no SSH involved
+        if self.config.use_http_upload:
+            return self.upload_tar_stream(local_path, repo_id, progress_callback)
+
         # TAR MODE: Create tar archive and upload single file
         if use_tar:
             # Create parent directory on remote (for tar file)
-            if not self.create_remote_directory(self.config.api_username):
+            if not self.prepare_remote(self.config.api_username)["ok"]:
                 log("Failed to create remote parent directory")
                 return False
 
@@ -789,11 +1114,16 @@ class EdgeUploader:
 
         # DIRECT MODE: Upload files individually (fallback or explicit)
         # Create remote directory (includes username subdirectory)
-        if not self.create_remote_directory(upload_subpath):
+        if not self.prepare_remote(upload_subpath)["ok"]:
             return False
 
+        # A manifest left by an interrupted rsync sync lets us resume instead of starting over
+        manifest = {} if self._use_paramiko() else self._load_manifest(local_path, upload_path)
+
         # Clear remote directory before upload to avoid leftover files
-        if not self.clear_remote_directory(upload_subpath):
+        if manifest:
+            log(f"Resuming interrupted sync: {len(manifest)} shard(s) already on edge server")
+        elif not self.clear_remote_directory(upload_subpath):
             log("Warning: Failed to clear remote directory, continuing with upload...")
 
         remote_path = upload_path
@@ -814,62 +1144,234 @@ class EdgeUploader:
                 log(f"SFTP sync error: {e}")
                 return False
 
-        # Fall back to rsync for key-based auth
-        rsync_cmd = self._build_rsync_cmd(local_path, upload_subpath)
+        # Fall back to rsync for key-based auth, one rsync process per shard
+        shards = self._rsync_shards(local_path)
+        # rsync only creates the last path component, so make parents of nested shards first
+        parents = sorted({str(Path(shard).parent) for shard in shards if "/" in shard})
+        if parents and not self.create_remote_directory_batch([f"{upload_subpath}/{p}" for p in parents]):
+            return False
+
+        jobs = {}
+        signatures = {}
+        for shard in shards:
+            signatures[shard] = self._shard_signature(local_path, shard)
+            if manifest.get(shard) == signatures[shard]:
+                continue  # Uploaded by a previous attempt and unchanged since
 
-        log(f"Running: {' '.join(rsync_cmd[:5])}...")  # Don't log full command (may have secrets)
+            if shard:
+                jobs[shard] = self._build_rsync_cmd(
+                    str(Path(local_path) / shard), f"{upload_subpath}/{shard}"
+                )
+            else:
+                # Root job only carries loose top-level files; directories belong
+                # to their own shards and are protected from --delete by the exclude
+                jobs[shard] = self._build_rsync_cmd(
+                    local_path, upload_subpath, ["--exclude=*/"]
+                )
+
+        if not jobs:
+            self._remove_manifest(local_path)
+            log("All shards already uploaded")
+            return True
+
+        workers = max(1, min(self.config.rsync_parallel, len(jobs)))
+        log(f"Running {len(jobs)} rsync job(s) with {workers} worker(s)...")
+
+        manifest_lock = threading.Lock()
+
+        def record_shard(shard: str, future: Future):
+            if future.exception() is None and future.result() == 0:
+                with manifest_lock:
+                    manifest[shard] = signatures[shard]
+                    self._save_manifest(local_path, upload_path, manifest)
 
         try:
-            # Run rsync with real-time output
-            process = subprocess.Popen(
-                rsync_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-            )
+            lines: "queue.Queue[tuple[str, bytes]]" = queue.Queue()
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="edge-rsync") as pool:
+                futures = {
+                    shard: pool.submit(self._run_rsync_job, shard, cmd, lines)
+                    for shard, cmd in jobs.items()
+                }
+                for shard, future in futures.items():
+                    future.add_done_callback(lambda f, shard=shard: record_shard(shard, f))
+
+                # Single reader so progress_callback is never called concurrently
+                while True:
+                    finished = all(f.done() for f in futures.values())
+                    try:
+                        shard, line = lines.get(timeout=0.1)
+                    except queue.Empty:
+                        if finished:
+                            break
+                        continue
 
-            last_progress = ""
-            for line in process.stdout:
-                line = line.strip()
-                if line:
                     # Parse progress from rsync output
-                    if "%" in line:
-                        last_progress = line
+                    if _PROGRESS_RE.search(line):
                         if progress_callback:
-                            progress_callback(line)
-                    elif "sent" in line.lower() or "total" in line.lower():
-                        log(line)
-
-            process.wait()
+                            progress_callback(f"[{shard or '.'}] {line.decode('ascii', errors='replace').strip()}")
+                    elif _SUMMARY_RE.search(line):
+                        log(f"[{shard or '.'}] {line.decode('utf-8', errors='replace').strip()}")
 
             elapsed = time.time() - start_time
+            failed = {shard: f.result() for shard, f in futures.items() if f.result() != 0}
 
-            if process.returncode == 0:
+            if not failed:
+                self._remove_manifest(local_path)
                 log(f"Sync completed in {elapsed:.1f}s")
                 return True
             else:
-                log(f"Sync failed with exit code {process.returncode}")
+                for shard, returncode in failed.items():
+                    log(f"Sync of '{shard or '.'}' failed with exit code {returncode}")
                 return False
 
         except Exception as e:
             log(f"Sync error: {e}")
             return False
 
-    def notify_upload_complete(self, repo_id: str, is_tar: bool = True) -> bool:
+    def _rsync_shards(self, local_path: str) -> list[str]:
+        """
+        Split a dataset directory into independent rsync jobs.
+
+        Returns paths relative to local_path. images/, videos/ and audio/ hold
+        most of the data and are split per camera (or audio) key, i.e. one shard
+        per images/<key> and per videos|audio/chunk-XXX/<key>; every other
+        top-level directory is one shard, and "" (the root) carries any loose
+        top-level files. A directory that mixes files and subdirectories is
+        never split further.
+        """
+        root = Path(local_path)
+        shards = []
+        has_loose_files = False
+
+        def expand(rel: str, path: Path, depth: int):
+            children = sorted(path.iterdir()) if depth else []
+            if not children or not all(c.is_dir() for c in children):
+                shards.append(rel)
+                return
+            for child in children:
+                expand(f"{rel}/{child.name}", child, depth - 1)
+
+        for entry in sorted(root.iterdir()):
+            if not entry.is_dir():
+                has_loose_files = True
+                continue
+            expand(entry.name, entry, _RSYNC_SHARD_DEPTH.get(entry.name, 0))
+
+        if has_loose_files or not shards:
+            shards.append("")
+
+        return shards
+
+    @staticmethod
+    def _shard_signature(local_path: str, shard: str) -> dict:
+        """File count, total size and newest mtime of a shard, to detect changes since upload"""
+        root = Path(local_path) / shard
+        files = [p for p in (root.rglob("*") if shard else root.iterdir()) if p.is_file()]
+        stats = [p.stat() for p in files]
+        return {
+            "files": len(stats),
+            "bytes": sum(st.st_size for st in stats),
+            "mtime": max((st.st_mtime for st in stats), default=0.0),
+        }
+
+    @staticmethod
+    def _manifest_path(local_path: str) -> Path:
+        """Upload manifest location for a dataset, keyed by its resolved path"""
+        key = hashlib.sha1(str(Path(local_path).resolve()).encode("utf-8")).hexdigest()
+        return UPLOAD_MANIFEST_DIR / f"{key}.json"
+
+    @staticmethod
+    def _load_manifest(local_path: str, upload_path: str) -> dict:
+        """Load the shards recorded as uploaded to upload_path, if any"""
+        manifest_path = EdgeUploader._manifest_path(local_path)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        # A manifest for another destination says nothing about this one
+        if data.get("dest") != upload_path:
+            return {}
+        return data.get("shards", {})
+
+    @staticmethod
+    def _save_manifest(local_path: str, upload_path: str, shards: dict):
+        manifest_path = EdgeUploader._manifest_path(local_path)
+        tmp_path = manifest_path.with_suffix(".tmp")
+        try:
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"dest": upload_path, "shards": shards}, f, indent=2)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            log(f"Warning: Failed to write upload manifest: {e}")
+
+    @staticmethod
+    def _remove_manifest(local_path: str):
+        try:
+            EdgeUploader._manifest_path(local_path).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _run_rsync_job(self, shard: str, cmd: list[str], lines: "queue.Queue[tuple[str, bytes]]") -> int:
+        """Run one rsync process, forwarding its raw output records to the reader queue"""
+        # Binary, unbuffered pipe: records are read straight from the fd and
+        # only decoded when shown, so a text wrapper would be pure overhead
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=False,
+            bufsize=0,
+        )
+
+        # Read raw chunks as they arrive instead of waiting for "\n", since
+        # progress updates are only terminated by "\r"
+        fd = process.stdout.fileno()
+        os.set_blocking(fd, False)
+        buffer = b""
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                if not selector.select(timeout=0.1):
+                    continue
+                try:
+                    chunk = os.read(fd, 4096)
+                except BlockingIOError:
+                    continue
+                if not chunk:
+                    break
+
+                *records, buffer = _RECORD_SEP_RE.split(buffer + chunk)
+                for record in records:
+                    if record:
+                        lines.put((shard, record))
+
+        if buffer:
+            lines.put((shard, buffer))
+
+        return process.wait()
+
+    def notify_upload_complete(self, repo_id: str, is_tar: Optional[bool] = None) -> bool:
         """
         Notify edge server that upload is complete.
         This triggers encoding and cloud upload.
 
         Args:
             repo_id: Dataset repository ID
-            is_tar: Whether upload is a tar file (default True for tar mode)
+            is_tar: Whether upload is a tar file (default True for tar mode, False
+                    for HTTP mode where the edge server already extracted it)
 
         Note:
             For tar mode: Edge server extracts {remote_path}/{api_username}/{repo_id}.tar
             For direct mode: Dataset path is {remote_path}/{api_username}/{repo_id}/
             Cloud credentials are passed so edge server can upload to cloud training server.
         """
+        if is_tar is None:
+            is_tar = not self.config.use_http_upload
+
         if is_tar:
             # Tar file path: {remote_path}/{api_username}/{repo_id}.tar
             tar_path = f"{self.config.remote_path}/{self.config.api_username}/{repo_id}.tar"
@@ -902,7 +1404,7 @@ class EdgeUploader:
             log(f"  Cloud credentials: included for {self.config.api_username}")
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.config.api_url}/edge/upload-complete",
                 json=payload,
                 timeout=60,  # Increased timeout for tar extraction
@@ -923,16 +1425,34 @@ class EdgeUploader:
             log(f"Error notifying edge server: {e}")
             return False
 
-    def get_status(self, repo_id: str) -> dict:
-        """Get encoding/upload status from edge server"""
+    def get_status(self, repo_id: str, etag: Optional[str] = None) -> dict:
+        """
+        Get encoding/upload status from edge server.
+
+        Args:
+            repo_id: Dataset repository ID
+            etag: Last observed status. When given, asks the server to long-poll:
+                  hold the request open until the status differs from etag (or
+                  its own ~30s timeout) instead of answering immediately.
+        """
+        params = None
+        timeout = 30
+        if etag is not None:
+            params = {"wait_for_change": 1, "etag": etag}
+            timeout = (5, 35)  # (connect, read) - read must outlast the server hold
+
         try:
-            response = requests.get(
+            response = self._http.get(
                 f"{self.config.api_url}/edge/status/{repo_id}",
-                timeout=30,
+                params=params,
+                timeout=timeout,
             )
 
             if response.status_code == 200:
                 return response.json()
+            elif response.status_code == 304 and etag is not None:
+                # Long-poll timed out without a change
+                return {"status": etag}
             else:
                 return {"status": "UNKNOWN", "error": response.text}
 
@@ -963,7 +1483,7 @@ class EdgeUploader:
             payload["cloud_password"] = self.config.api_password
 
         try:
-            response = requests.post(
+            response = self._http.post(
                 f"{self.config.api_url}/edge/train",
                 json=payload,
                 timeout=30,
@@ -1177,8 +1697,11 @@ class EdgeUploader:
         timeout_seconds = timeout_minutes * 60
         training_triggered = False  # Track if we've successfully triggered training
 
+        last_status = ""
+
         while (time.time() - start_time) < timeout_seconds:
-            status = self.get_status(repo_id)
+            request_start = time.time()
+            status = self.get_status(repo_id, etag=last_status)
 
             current_status = status.get("status", "UNKNOWN")
             progress = status.get("progress", "")
@@ -1230,7 +1753,15 @@ class EdgeUploader:
                     log("Warning: Failed to re-trigger training, will retry...")
                 # Continue polling regardless
 
-            time.sleep(poll_interval)
+            # A long-polling server only answers early on a status change; if it
+            # answered early without one (server ignores wait_for_change, or an
+            # error), fall back to pacing requests at poll_interval
+            if current_status == last_status:
+                now = time.time()
+                remaining = min(poll_interval - (now - request_start), timeout_seconds - (now - start_time))
+                if remaining > 0:
+                    time.sleep(remaining)
+            last_status = current_status
 
         log("Training monitoring timeout")
         return False, None
@@ -1240,86 +1771,222 @@ class EdgeUploadThread(threading.Thread):
     """
     Background thread for edge upload.
     Allows recording to continue while upload happens.
+
+    Works as a producer-consumer pipeline: datasets are pushed with submit()
+    as soon as they are ready, and uploaded (sync + notify + optional
+    training trigger) by a worker pool while recording continues. Passing
+    local_path/repo_id to the constructor uploads that single dataset.
     """
 
     def __init__(
         self,
-        local_path: str,
-        repo_id: str,
+        local_path: Optional[str] = None,
+        repo_id: Optional[str] = None,
         config: Optional[EdgeConfig] = None,
         trigger_training: bool = True,
+        max_workers: int = 1,
+        max_retries: int = 3,
     ):
         super().__init__(daemon=True)
         self.local_path = local_path
         self.repo_id = repo_id
         self.config = config
         self.trigger_training = trigger_training
-
-        self.success = False
-        self.error_message = None
-        self.current_status = "INITIALIZING"
-        self.current_progress = ""
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+
+        # (local_path, repo_id) items; None marks the end of the stream
+        self.upload_queue: "queue.Queue[Optional[tuple[str, str]]]" = queue.Queue()
+        self._pending: list[Future] = []
+
+        # (status, progress, success, error, completed), replaced as a whole by
+        # _set() so get_status() never sees a half-updated state. Reads are a
+        # single reference load; the lock only serializes concurrent writers.
+        self._snapshot: tuple = ("INITIALIZING", "", False, None, False)
+        # repo_id -> (status, progress, error) of each dataset. Workers only
+        # write their own entry, so with max_workers > 1 one upload can no
+        # longer overwrite another's progress or error; the thread snapshot
+        # above mirrors whichever job changed last, all fields at once.
+        self._jobs: dict[str, tuple] = {}
+        self._snapshot_lock = threading.Lock()
         self.completed = threading.Event()
 
+        if local_path is not None:
+            self.submit(local_path, repo_id)
+            self.close()
+
+    def submit(self, local_path: str, repo_id: str):
+        """Queue a dataset for upload"""
+        self.upload_queue.put((local_path, repo_id))
+
+    def close(self):
+        """Signal that no more datasets will be submitted"""
+        self.upload_queue.put(None)
+
+    def flush(self):
+        """
+        Block until every dataset submitted so far has been uploaded.
+
+        Raises RuntimeError if the upload thread is not running (never started,
+        or already exited) while datasets are still queued.
+        """
+        done = self.upload_queue.all_tasks_done
+        with done:
+            while self.upload_queue.unfinished_tasks:
+                if not self.is_alive():
+                    raise RuntimeError(
+                        f"Edge upload thread is not running ({self.error_message or self.current_status})"
+                    )
+                done.wait(timeout=0.5)
+        for future in list(self._pending):
+            future.result()
+
     def run(self):
         try:
+            # Test connection (and create the user's upload directory on the way)
+            self._set(status="CONNECTING")
             uploader = EdgeUploader(self.config)
+            try:
+                # HTTP uploads only talk to the edge API, so they need no SSH access
+                if uploader.config.use_http_upload:
+                    connected = True
+                else:
+                    connected = uploader.prepare_remote(uploader.config.api_username)["ok"]
+            finally:
+                uploader.close()
 
-            # Test connection
-            self.current_status = "CONNECTING"
-            if not uploader.test_connection():
-                self.error_message = "Cannot connect to edge server"
-                self.current_status = "FAILED"
+            if not connected:
+                self._set(status="FAILED", error="Cannot connect to edge server")
                 return
 
-            # Sync dataset
-            self.current_status = "UPLOADING"
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="edge-upload") as pool:
+                while True:
+                    item = self.upload_queue.get()
+                    try:
+                        if item is None:
+                            break
+                        self._pending.append(pool.submit(self._upload_with_retry, *item))
+                    finally:
+                        self.upload_queue.task_done()
+
+                results = [future.result() for future in self._pending]
+
+            success = all(results)
+            errors = [f"{repo_id}: {error}" for repo_id, (_, _, error) in self._jobs.items() if error]
+            self._set(
+                status="COMPLETED" if success else "FAILED",
+                success=success,
+                error="; ".join(errors) if errors else None,
+            )
+
+        except Exception as e:
+            self._set(status="ERROR", success=False, error=str(e))
+            log(f"Edge upload thread error: {e}")
+        finally:
+            self._set(completed=True)
+            self.completed.set()
 
-            def progress_cb(progress: str):
-                self.current_progress = progress
+    def _upload_with_retry(self, local_path: str, repo_id: str) -> bool:
+        """Sync one dataset and notify the edge server, retrying each failed step"""
 
-            if not uploader.sync_dataset(self.local_path, self.repo_id, progress_cb):
-                self.error_message = "Dataset sync failed"
-                self.current_status = "FAILED"
-                return
+        def progress_cb(progress: str):
+            self._set_job(repo_id, progress=progress)
 
-            # Notify edge server
-            self.current_status = "NOTIFYING"
-            if not uploader.notify_upload_complete(self.repo_id):
-                self.error_message = "Failed to notify edge server"
-                self.current_status = "FAILED"
-                return
+        uploader = EdgeUploader(self.config)
+        try:
+            # Sync dataset
+            self._set_job(repo_id, status="UPLOADING")
+            if not self._retry(repo_id, "Dataset sync", lambda: uploader.sync_dataset(local_path, repo_id, progress_cb)):
+                self._set_job(repo_id, status="FAILED", error="Dataset sync failed")
+                return False
+
+            # Notify edge server; a failure here does not resend the dataset
+            self._set_job(repo_id, status="NOTIFYING")
+            if not self._retry(repo_id, "Notify", lambda: uploader.notify_upload_complete(repo_id)):
+                self._set_job(repo_id, status="FAILED", error="Failed to notify edge server")
+                return False
 
             # Optionally trigger training
             if self.trigger_training:
-                self.current_status = "TRIGGERING_TRAINING"
-                success, _ = uploader.trigger_training(self.repo_id)
+                self._set_job(repo_id, status="TRIGGERING_TRAINING")
+                success, _ = uploader.trigger_training(repo_id)
                 if not success:
                     log("Warning: Failed to trigger training")
 
-            self.success = True
-            self.current_status = "COMPLETED"
-
-        except Exception as e:
-            self.success = False
-            self.error_message = str(e)
-            self.current_status = "ERROR"
-            log(f"Edge upload thread error: {e}")
+            self._set_job(repo_id, status="UPLOADED")
+            return True
         finally:
-            self.completed.set()
+            uploader.close()
+
+    def _retry(self, repo_id: str, step: str, fn: Callable[[], bool]) -> bool:
+        """Run fn, then retry it up to max_retries times with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = 2 ** attempt
+                log(f"{step} of {repo_id} failed, retrying in {delay}s ({attempt}/{self.max_retries})")
+                time.sleep(delay)
+            if fn():
+                return True
+        return False
 
     def wait_for_completion(self, timeout: float = None) -> bool:
         """Wait for upload to complete"""
         return self.completed.wait(timeout=timeout)
 
+    def _set(self, **fields):
+        """Publish a new status snapshot with the given fields changed"""
+        with self._snapshot_lock:
+            status, progress, success, error, completed = self._snapshot
+            self._snapshot = (
+                fields.get("status", status),
+                fields.get("progress", progress),
+                fields.get("success", success),
+                fields.get("error", error),
+                fields.get("completed", completed),
+            )
+
+    def _set_job(self, repo_id: str, **fields):
+        """Update one dataset's snapshot and mirror it as the thread status"""
+        with self._snapshot_lock:
+            status, progress, error = self._jobs.get(repo_id, ("QUEUED", "", None))
+            job = (
+                fields.get("status", status),
+                fields.get("progress", progress),
+                fields.get("error", error),
+            )
+            self._jobs = {**self._jobs, repo_id: job}
+            _, _, success, _, completed = self._snapshot
+            self._snapshot = (*job, success, completed)
+
+    @property
+    def current_status(self) -> str:
+        return self._snapshot[0]
+
+    @property
+    def current_progress(self) -> str:
+        return self._snapshot[1]
+
+    @property
+    def success(self) -> bool:
+        return self._snapshot[2]
+
+    @property
+    def error_message(self) -> Optional[str]:
+        return self._snapshot[3]
+
     def get_status(self) -> dict:
         """Get current upload status"""
+        status, progress, success, error, completed = self._snapshot
         return {
-            "status": self.current_status,
-            "progress": self.current_progress,
-            "success": self.success,
-            "error": self.error_message,
-            "completed": self.completed.is_set(),
+            "status": status,
+            "progress": progress,
+            "success": success,
+            "error": error,
+            "completed": completed,
+            "jobs": {
+                repo_id: {"status": status, "progress": progress, "error": error}
+                for repo_id, (status, progress, error) in self._jobs.items()
+            },
         }
 
 
@@ -1347,96 +2014,96 @@ def run_edge_upload(
     Returns:
         True if upload (and optionally training + model download) successful
     """
-    uploader = EdgeUploader()
-
-    # Test connection
-    if not uploader.test_connection():
-        log("Cannot connect to edge server")
-        return False
-
-    # Sync dataset
-    def progress_cb(progress: str):
-        if status_callback:
-            status_callback("UPLOADING", progress)
-
-    if not uploader.sync_dataset(dataset_path, repo_id, progress_cb):
-        log("Dataset sync failed")
-        return False
+    # Closing tears down the SSH master connection and the HTTP session
+    with EdgeUploader() as uploader:
+        # Test connection
+        if not uploader.test_connection():
+            log("Cannot connect to edge server")
+            return False
 
-    # Notify edge server
-    if not uploader.notify_upload_complete(repo_id):
-        log("Failed to notify edge server")
-        return False
+        # Sync dataset
+        def progress_cb(progress: str):
+            if status_callback:
+                status_callback("UPLOADING", progress)
 
-    # Trigger training
-    if trigger_training:
-        success, transaction_id = uploader.trigger_training(repo_id)
-        if not success:
-            log("Failed to trigger training")
+        if not uploader.sync_dataset(dataset_path, repo_id, progress_cb):
+            log("Dataset sync failed")
             return False
 
-        # Wait for training if requested
-        if wait_for_training:
-            success, status_info = uploader.poll_training_status(
-                repo_id,
-                timeout_minutes=timeout_minutes,
-                status_callback=status_callback,
-            )
+        # Notify edge server
+        if not uploader.notify_upload_complete(repo_id):
+            log("Failed to notify edge server")
+            return False
 
+        # Trigger training
+        if trigger_training:
+            success, transaction_id = uploader.trigger_training(repo_id)
             if not success:
-                log("Training failed or timed out")
+                log("Failed to trigger training")
                 return False
 
-            # Download model if output path specified and training succeeded
-            if model_output_path and status_info:
-                log(f"Downloading model to {model_output_path}...")
-                if status_callback:
-                    status_callback("DOWNLOADING_MODEL", "Starting download...")
-
-                # Extract SSH credentials for SFTP download from cloud server
-                ssh_host = status_info.get("ssh_host")
-                ssh_username = status_info.get("ssh_username")
-                ssh_password_b64 = status_info.get("ssh_password")  # base64 encoded
-                ssh_port = status_info.get("ssh_port")
-                model_path = status_info.get("model_path")
-
-                if not all([ssh_host, ssh_username, ssh_password_b64, model_path]):
-                    log(f"Missing SSH/model info for download:")
-                    log(f"  ssh_host={ssh_host}, ssh_username={ssh_username}")
-                    log(f"  ssh_password={'SET' if ssh_password_b64 else 'NOT SET'}")
-                    log(f"  ssh_port={ssh_port}, model_path={model_path}")
-                    return False
+            # Wait for training if requested
+            if wait_for_training:
+                success, status_info = uploader.poll_training_status(
+                    repo_id,
+                    timeout_minutes=timeout_minutes,
+                    status_callback=status_callback,
+                )
 
-                # Decode base64-encoded password
-                import base64
-                try:
-                    ssh_password = base64.b64decode(ssh_password_b64).decode('utf-8')
-                except Exception as e:
-                    log(f"Failed to decode SSH password: {e}")
+                if not success:
+                    log("Training failed or timed out")
                     return False
 
-                # Download directly from cloud server via SFTP (bypassing edge)
-                download_success = uploader.download_model_from_cloud(
-                    ssh_host=ssh_host,
-                    ssh_username=ssh_username,
-                    ssh_password=ssh_password,
-                    ssh_port=int(ssh_port) if ssh_port else 22,
-                    remote_model_path=model_path,
-                    local_output_path=model_output_path,
-                    progress_callback=lambda p: status_callback("DOWNLOADING_MODEL", p) if status_callback else None
-                )
+                # Download model if output path specified and training succeeded
+                if model_output_path and status_info:
+                    log(f"Downloading model to {model_output_path}...")
+                    if status_callback:
+                        status_callback("DOWNLOADING_MODEL", "Starting download...")
+
+                    # Extract SSH credentials for SFTP download from cloud server
+                    ssh_host = status_info.get("ssh_host")
+                    ssh_username = status_info.get("ssh_username")
+                    ssh_password_b64 = status_info.get("ssh_password")  # base64 encoded
+                    ssh_port = status_info.get("ssh_port")
+                    model_path = status_info.get("model_path")
+
+                    if not all([ssh_host, ssh_username, ssh_password_b64, model_path]):
+                        log(f"Missing SSH/model info for download:")
+                        log(f"  ssh_host={ssh_host}, ssh_username={ssh_username}")
+                        log(f"  ssh_password={'SET' if ssh_password_b64 else 'NOT SET'}")
+                        log(f"  ssh_port={ssh_port}, model_path={model_path}")
+                        return False
+
+                    # Decode base64-encoded password
+                    import base64
+                    try:
+                        ssh_password = base64.b64decode(ssh_password_b64).decode('utf-8')
+                    except Exception as e:
+                        log(f"Failed to decode SSH password: {e}")
+                        return False
+
+                    # Download directly from cloud server via SFTP (bypassing edge)
+                    download_success = uploader.download_model_from_cloud(
+                        ssh_host=ssh_host,
+                        ssh_username=ssh_username,
+                        ssh_password=ssh_password,
+                        ssh_port=int(ssh_port) if ssh_port else 22,
+                        remote_model_path=model_path,
+                        local_output_path=model_output_path,
+                        progress_callback=lambda p: status_callback("DOWNLOADING_MODEL", p) if status_callback else None
+                    )
 
-                if not download_success:
-                    log("Model download failed")
-                    return False
+                    if not download_success:
+                        log("Model download failed")
+                        return False
 
-                log(f"Model downloaded successfully to: {model_output_path}")
+                    log(f"Model downloaded successfully to: {model_output_path}")
 
-                # Post-processing: modify config.json device setting for local inference
-                log("Post-download processing: updating config.json device setting...")
-                if not modify_config_device(model_output_path, from_device="npu", to_device="cuda"):
-                    log("Warning: Failed to update config.json device setting, but continuing...")
+                    # Post-processing: modify config.json device setting for local inference
+                    log("Post-download processing: updating config.json device setting...")
+                    if not modify_config_device(model_output_path, from_device="npu", to_device="cuda"):
+                        log("Warning: Failed to update config.json device setting, but continuing...")
 
-            return True
+                return True
 
-    return True
+        return True
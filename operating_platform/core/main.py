@@ -111,9 +111,10 @@ def test_edge_connection() -> bool:
     logging.info(f"Edge server: {config.user}@{config.host}:{config.port}")
     logging.info(f"Remote path: {config.remote_path}")
 
-    uploader = EdgeUploader(config)
     # Use quick_test=True for faster startup (5s timeout instead of 30s+60s)
-    if uploader.test_connection(quick_test=True):
+    with EdgeUploader(config) as uploader:
+        connected = uploader.test_connection(quick_test=True)
+    if connected:
         logging.info("Edge server connection successful!")
         return True
     else:
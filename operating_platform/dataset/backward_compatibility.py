@@ -1,3 +1,5 @@
+import functools
+
 import packaging.version
 
 V2_MESSAGE = """
@@ -39,16 +41,36 @@ As we cannot ensure forward compatibility with it, please update your current ve
 """
 
 
+# Parsed once at import instead of on every raise
+_V2 = packaging.version.Version("2.0")
+
+_MESSAGE_FOR_BUCKET = {
+    "v1": V2_MESSAGE,
+    "v2": V21_MESSAGE,
+    "future": FUTURE_MESSAGE,
+}
+
+
+def _bucket(version: packaging.version.Version) -> str:
+    """Pick the backward-compatibility message that applies to a dataset version."""
+    return "v1" if version < _V2 else "v2"
+
+
+@functools.lru_cache(maxsize=64)
+def _build_message(bucket: str, repo_id: str, version: str) -> str:
+    return _MESSAGE_FOR_BUCKET[bucket].format(repo_id=repo_id, version=version)
+
+
 class CompatibilityError(Exception): ...
 
 
 class BackwardCompatibilityError(CompatibilityError):
     def __init__(self, repo_id: str, version: packaging.version.Version):
-        message = V2_MESSAGE.format(repo_id=repo_id, version=version)
+        message = _build_message(_bucket(version), repo_id, str(version))
         super().__init__(message)
 
 
 class ForwardCompatibilityError(CompatibilityError):
     def __init__(self, repo_id: str, version: packaging.version.Version):
-        message = FUTURE_MESSAGE.format(repo_id=repo_id, version=version)
+        message = _build_message("future", repo_id, str(version))
         super().__init__(message)
@@ -13,6 +13,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
 from operating_platform.utils.dataset import load_image_as_numpy
@@ -54,34 +57,76 @@ def auto_downsample_height_width(img: np.ndarray, target_size: int = 150, max_si
     return img[:, ::downsample_factor, ::downsample_factor]
 
 
-def sample_images(image_paths: list[str]) -> np.ndarray:
+def sample_images(image_paths: list[str], num_workers: int | None = None) -> np.ndarray:
     sampled_indices = sample_indices(len(image_paths))
 
-    images = None
-    for i, idx in enumerate(sampled_indices):
-        path = image_paths[idx]
+    def load(path: str) -> np.ndarray:
         # we load as uint8 to reduce memory usage
-        img = load_image_as_numpy(path, dtype=np.uint8, channel_first=True)
-        img = auto_downsample_height_width(img)
+        return auto_downsample_height_width(load_image_as_numpy(path, dtype=np.uint8, channel_first=True))
+
+    # Decode the first image to learn the output shape, then decode the rest in
+    # parallel (PIL releases the GIL while decoding) straight into the buffer
+    first = load(image_paths[sampled_indices[0]])
+    images = np.empty((len(sampled_indices), *first.shape), dtype=np.uint8)
+    images[0] = first
 
-        if images is None:
-            images = np.empty((len(sampled_indices), *img.shape), dtype=np.uint8)
+    if num_workers is None:
+        num_workers = min(8, os.cpu_count() or 1)
 
-        images[i] = img
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        paths = (image_paths[idx] for idx in sampled_indices[1:])
+        for i, img in enumerate(executor.map(load, paths), start=1):
+            images[i] = img
 
     return images
 
 
 def get_feature_stats(array: np.ndarray, axis: tuple, keepdims: bool) -> dict[str, np.ndarray]:
+    # np.std would recompute the mean internally, so compute it once and reuse it
+    mean = np.mean(array, axis=axis, keepdims=True)
+    # Square the deviations in place rather than allocating a second array-sized temporary
+    sq_dev = array - mean
+    np.square(sq_dev, out=sq_dev)
+    std = np.sqrt(np.mean(sq_dev, axis=axis, keepdims=keepdims))
+    if not keepdims:
+        mean = np.squeeze(mean, axis=axis)
     return {
         "min": np.min(array, axis=axis, keepdims=keepdims),
         "max": np.max(array, axis=axis, keepdims=keepdims),
-        "mean": np.mean(array, axis=axis, keepdims=keepdims),
-        "std": np.std(array, axis=axis, keepdims=keepdims),
+        "mean": mean,
+        "std": std,
         "count": np.array([len(array)]),
     }
 
 
+def get_image_stats(images: np.ndarray) -> dict[str, np.ndarray]:
+    """Exact per-channel stats of uint8 images shaped (N, C, H, W).
+
+    Equivalent to get_feature_stats(images, axis=(0, 2, 3), keepdims=True), but
+    since uint8 pixels only take 256 values, each channel is reduced to a
+    256-bin histogram in one O(N) bincount pass and every stat is read off it.
+    """
+    num_channels = images.shape[1]
+    values = np.arange(256, dtype=np.float64)
+    hist = np.stack([np.bincount(images[:, c].ravel(), minlength=256) for c in range(num_channels)])
+
+    count = hist.sum(axis=1)
+    mean = hist @ values / count
+    var = (hist * np.square(values[None, :] - mean[:, None])).sum(axis=1) / count
+    nonzero = hist > 0
+    ch_min = nonzero.argmax(axis=1)
+    ch_max = 255 - nonzero[:, ::-1].argmax(axis=1)
+
+    shape = (1, num_channels, 1, 1)
+    return {
+        "min": ch_min.astype(np.uint8).reshape(shape),
+        "max": ch_max.astype(np.uint8).reshape(shape),
+        "mean": mean.reshape(shape),
+        "std": np.sqrt(var).reshape(shape),
+        "count": np.array([len(images)]),
+    }
+
+
 def compute_episode_stats(episode_data: dict[str, list[str] | np.ndarray], features: dict) -> dict:
     ep_stats = {}
     for key, data in episode_data.items():
@@ -89,14 +134,12 @@ def compute_episode_stats(episode_data: dict[str, list[str] | np.ndarray], featu
             continue  # HACK: we should receive np.arrays of strings
         elif features[key]["dtype"] in ["image", "video"]:
             ep_ft_array = sample_images(data)  # data is a list of image paths
-            axes_to_reduce = (0, 2, 3)  # keep channel dim
-            keepdims = True
+            ep_stats[key] = get_image_stats(ep_ft_array)  # keep channel dim
         else:
             ep_ft_array = data  # data is already a np.ndarray
             axes_to_reduce = 0  # compute stats over the first axis
             keepdims = data.ndim == 1  # keep as np.array
-
-        ep_stats[key] = get_feature_stats(ep_ft_array, axis=axes_to_reduce, keepdims=keepdims)
+            ep_stats[key] = get_feature_stats(ep_ft_array, axis=axes_to_reduce, keepdims=keepdims)
 
         # finally, we normalize and remove batch dim for images
         if features[key]["dtype"] in ["image", "video"]:
@@ -124,30 +167,34 @@ def _assert_type_and_shape(stats_list: list[dict[str, dict]]):
 
 
 def aggregate_feature_stats(stats_ft_list: list[dict[str, dict]]) -> dict[str, dict[str, np.ndarray]]:
-    """Aggregates stats for a single feature."""
-    means = np.stack([s["mean"] for s in stats_ft_list])
-    variances = np.stack([s["std"] ** 2 for s in stats_ft_list])
-    counts = np.stack([s["count"] for s in stats_ft_list])
-    total_count = counts.sum(axis=0)
+    """Aggregates stats for a single feature.
 
-    # Prepare weighted mean by matching number of dimensions
-    while counts.ndim < means.ndim:
-        counts = np.expand_dims(counts, axis=-1)
-
-    # Compute the weighted mean
-    weighted_means = means * counts
-    total_mean = weighted_means.sum(axis=0) / total_count
-
-    # Compute the variance using the parallel algorithm
-    delta_means = means - total_mean
-    weighted_variances = (variances + delta_means**2) * counts
-    total_variance = weighted_variances.sum(axis=0) / total_count
+    Folds episodes in one at a time with the parallel (Chan et al.) update of
+    (count, mean, M2), so memory stays O(feature shape) regardless of the
+    number of episodes.
+    """
+    first = stats_ft_list[0]
+    total_count = first["count"]
+    total_mean = first["mean"]
+    total_m2 = np.square(first["std"]) * total_count
+    total_min = first["min"]
+    total_max = first["max"]
+
+    for s in stats_ft_list[1:]:
+        count = s["count"]
+        new_count = total_count + count
+        delta = s["mean"] - total_mean
+        total_mean = total_mean + delta * (count / new_count)
+        total_m2 = total_m2 + np.square(s["std"]) * count + np.square(delta) * (total_count * count / new_count)
+        total_count = new_count
+        total_min = np.minimum(total_min, s["min"])
+        total_max = np.maximum(total_max, s["max"])
 
     return {
-        "min": np.min(np.stack([s["min"] for s in stats_ft_list]), axis=0),
-        "max": np.max(np.stack([s["max"] for s in stats_ft_list]), axis=0),
+        "min": total_min,
+        "max": total_max,
         "mean": total_mean,
-        "std": np.sqrt(total_variance),
+        "std": np.sqrt(total_m2 / total_count),
         "count": total_count,
     }
 
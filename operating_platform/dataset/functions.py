@@ -1,3 +1,4 @@
+import functools
 import logging
 import packaging.version
 from huggingface_hub.errors import RevisionNotFoundError
@@ -14,6 +15,13 @@ from operating_platform.utils.dataset import get_repo_versions, DEFAULT_FEATURES
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=32)
+def _parse_version(version: str) -> packaging.version.Version:
+    # Version strings here are a handful of constants (codebase/info.json versions),
+    # so parse each once rather than on every dataset load
+    return packaging.version.parse(version)
+
+
 def check_version_compatibility(
     repo_id: str,
     version_to_check: str | packaging.version.Version,
@@ -21,12 +29,12 @@ def check_version_compatibility(
     enforce_breaking_major: bool = True,
 ) -> None:
     v_check = (
-        packaging.version.parse(version_to_check)
+        _parse_version(version_to_check)
         if not isinstance(version_to_check, packaging.version.Version)
         else version_to_check
     )
     v_current = (
-        packaging.version.parse(current_version)
+        _parse_version(current_version)
         if not isinstance(current_version, packaging.version.Version)
         else current_version
     )
@@ -57,7 +65,7 @@ def get_safe_version(repo_id: str, version: str | packaging.version.Version) ->
     Otherwise, will throw a `CompatibilityError`.
     """
     target_version = (
-        packaging.version.parse(version) if not isinstance(version, packaging.version.Version) else version
+        _parse_version(version) if not isinstance(version, packaging.version.Version) else version
     )
     hub_versions = get_repo_versions(repo_id)
 
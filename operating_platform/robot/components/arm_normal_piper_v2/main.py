@@ -1,5 +1,6 @@
 """TODO: Add docstring."""
 
+import math
 import os
 import time
 
@@ -8,15 +9,38 @@ import pyarrow as pa
 from dora import Node
 from piper_sdk import C_PiperInterface
 
+# Unit conversions between dora (rad / m) and the piper SDK (0.001 deg / 0.001 mm)
+_RAD_TO_MDEG = 1000 * 180 / math.pi
+_MDEG_TO_RAD = 1 / _RAD_TO_MDEG
+_M_TO_UM = 1000 * 1000
+_UM_TO_M = 1e-6
+
+# Do not push commands to the arm faster than ~30Hz
+_CMD_PERIOD_NS = 30_000_000
+# How long a positive arm enable status is trusted before it is re-read
+_ENABLE_CHECK_PERIOD_S = 1.0
+
+
+def joint_commands(position: np.ndarray) -> list[int]:
+    """First six joints of an action, rad -> integer 0.001 deg for JointCtrl."""
+    # Computed in the action's own dtype, exactly like the per-joint round(position[i] * factor)
+    # this replaces: a float32 element times a Python float stays float32 (so does the
+    # array product), and np.rint rounds half to even like round(). Upcasting float32
+    # actions to float64 first would change ~0.4% of the commands by 1
+    return np.rint(position[:6] * _RAD_TO_MDEG).astype(np.int64).tolist()
+
 
 def enable_fun(piper: C_PiperInterface):
     """使能机械臂并检测使能状态,尝试5秒,如果使能超时则退出程序."""
     enable_flag = all(piper.GetArmEnableStatus())
 
     timeout = 5.0  # 超时时间（秒）- 增加到5秒以确保机械臂有足够时间使能
-    interval = 0.1  # 每次轮询间隔（秒）
+    interval = 0.02  # 首次轮询间隔（秒）,之后指数退避
+    max_interval = 0.2  # 最大轮询间隔（秒）
 
-    start_time = time.time()
+    # monotonic: unaffected by NTP steps on the embedded target
+    start_time = time.monotonic()
+    elapsed_time = 0.0
     retry_count = 0
     while not enable_flag:
         enable_flag = piper.EnablePiper()
@@ -26,8 +50,13 @@ def enable_fun(piper: C_PiperInterface):
         if retry_count % 10 == 1:
             print(f"[Piper] 使能状态: {enable_flag} (尝试 {retry_count})")
 
+        if enable_flag:
+            elapsed_time = time.monotonic() - start_time
+            break
+
         time.sleep(interval)
-        elapsed_time = time.time() - start_time
+        interval = min(interval * 1.5, max_interval)
+        elapsed_time = time.monotonic() - start_time
         if elapsed_time > timeout:
             print(f"[Piper] 机械臂自动使能超时 ({timeout}秒后)")
             print("[Piper] 请检查: 1) CAN总线连接 2) 机械臂电源 3) 急停按钮")
@@ -39,126 +68,148 @@ def enable_fun(piper: C_PiperInterface):
 
 def main():
     """TODO: Add docstring."""
-    elapsed_time = time.time()
     can_bus = os.getenv("CAN_BUS", "")
     piper = C_PiperInterface(can_bus)
     piper.ConnectPort()
     enable_fun(piper)
     # piper.GripperCtrl(0, 3000, 0x01, 0)
 
-    factor = 1000 * 180 / np.pi  # Convert rad to 0.001 degrees
     node = Node()
 
     # Initialize motion control once with a safe speed (e.g. 60%)
     # Sending this in every loop can cause jerky motion as it resets the planner.
     piper.MotionCtrl_2(0x01, 0x01, 60, 0x00)
+    motion_speed = 60  # Last speed sent with MotionCtrl_2
     
     ctrl_frame = 0
 
+    # Output buffers filled in place on every tick; send_output copies them out
+    slave_joint = np.empty(7, dtype=np.float32)
+    slave_pose = np.empty(6, dtype=np.float32)
+    master_joint = np.empty(7, dtype=np.float32)
+
+    # Per-command monotonic deadlines for the 30Hz rate limit
+    next_cmd_ns = {"action_joint": 0, "action_endpose": 0, "action_gripper": 0}
+
+    arm_enabled = False
+    next_enable_check = 0.0
+
+    pending_joint = None  # Newest action_joint not yet sent to the arm
+
+    def send_pending_joint() -> bool:
+        """Send the pending action_joint if the 30Hz window is open."""
+        nonlocal pending_joint
+        # Do not push to many commands to fast. Limiting it to 30Hz
+        now_ns = time.monotonic_ns()
+        if pending_joint is None or now_ns < next_cmd_ns["action_joint"]:
+            return False
+        next_cmd_ns["action_joint"] = now_ns + _CMD_PERIOD_NS
+
+        position, pending_joint = pending_joint, None
+        joints = joint_commands(position)
+        piper.JointCtrl(*joints)
+        if len(position) > 6 and not np.isnan(position[6]):
+            piper.GripperCtrl(int(abs(position[6] * _M_TO_UM)), 1000, 0x01, 0)
+        return True
+
     for event in node:
         if event["type"] == "INPUT":
+            event_id = event["id"]
             # Only enable if not already enabled to save CAN bandwidth
-            if "action" in event["id"]:
-                enable_flag = all(piper.GetArmEnableStatus())
-                if not enable_flag:
-                    enable_fun(piper)
-                    piper.MotionCtrl_2(0x01, 0x01, 60, 0x00)
-
-            if event["id"] == "action_joint":
+            if event_id.startswith("action"):
+                now = time.monotonic()
+                if not arm_enabled or now >= next_enable_check:
+                    arm_enabled = all(piper.GetArmEnableStatus())
+                    if not arm_enabled:
+                        enable_fun(piper)
+                        # Re-enabling resets the controller, so always resend the mode
+                        piper.MotionCtrl_2(0x01, 0x01, 60, 0x00)
+                        motion_speed = 60
+                        arm_enabled = all(piper.GetArmEnableStatus())
+                    next_enable_check = now + _ENABLE_CHECK_PERIOD_S
+
+            if event_id == "action_joint":
                 if ctrl_frame > 0:
                     continue
 
-                # Do not push to many commands to fast. Limiting it to 30Hz
-                if time.time() - elapsed_time > 0.03:
-                    elapsed_time = time.time()
-                else:
+                # Keep only the newest sample: a burst overwrites it until the 30Hz window
+                # opens, and one still waiting then is flushed by the next tick
+                pending_joint = event["value"].to_numpy()
+                if not send_pending_joint():
                     continue
 
-                position = event["value"].to_numpy()
-
-                joint_0 = round(position[0] * factor)
-                joint_1 = round(position[1] * factor)
-                joint_2 = round(position[2] * factor)
-                joint_3 = round(position[3] * factor)
-                joint_4 = round(position[4] * factor)
-                joint_5 = round(position[5] * factor)
-
-                piper.JointCtrl(joint_0, joint_1, joint_2, joint_3, joint_4, joint_5)
-                if len(position) > 6 and not np.isnan(position[6]):
-                    piper.GripperCtrl(int(abs(position[6] * 1000 * 1000)), 1000, 0x01, 0)
-
-            elif event["id"] == "action_joint_ctrl":
+            elif event_id == "action_joint_ctrl":
                 
                 ctrl_frame = 200
+                pending_joint = None
                 position = event["value"].to_numpy()
-                joint_0 = round(position[0] * factor)
-                joint_1 = round(position[1] * factor)
-                joint_2 = round(position[2] * factor)
-                joint_3 = round(position[3] * factor)
-                joint_4 = round(position[4] * factor)
-                joint_5 = round(position[5] * factor)
+                joints = joint_commands(position)
 
                 # For manual control, we might want higher speed
-                piper.MotionCtrl_2(0x01, 0x01, 100, 0x00)
-                piper.JointCtrl(joint_0, joint_1, joint_2, joint_3, joint_4, joint_5)
+                if motion_speed != 100:
+                    piper.MotionCtrl_2(0x01, 0x01, 100, 0x00)
+                    motion_speed = 100
+                piper.JointCtrl(*joints)
                 if len(position) > 6 and not np.isnan(position[6]):
-                    piper.GripperCtrl(int(abs(position[6] * 1000 * 1000)), 1000, 0x01, 0)
+                    piper.GripperCtrl(int(abs(position[6] * _M_TO_UM)), 1000, 0x01, 0)
 
-            elif event["id"] == "action_endpose":
+            elif event_id == "action_endpose":
                 
                 # Do not push to many commands to fast. Limiting it to 30Hz
-                if time.time() - elapsed_time > 0.03:
-                    elapsed_time = time.time()
-                else:
+                now_ns = time.monotonic_ns()
+                if now_ns < next_cmd_ns["action_endpose"]:
                     continue
+                next_cmd_ns["action_endpose"] = now_ns + _CMD_PERIOD_NS
 
                 position = event["value"].to_numpy()
                 piper.EndPoseCtrl(
-                    position[0] * 1000 * 1000,
-                    position[1] * 1000 * 1000,
-                    position[2] * 1000 * 1000,
-                    position[3] * 1000 / (2 * np.pi) * 360,
-                    position[4] * 1000 / (2 * np.pi) * 360,
-                    position[5] * 1000 / (2 * np.pi) * 360,
+                    position[0] * _M_TO_UM,
+                    position[1] * _M_TO_UM,
+                    position[2] * _M_TO_UM,
+                    position[3] * _RAD_TO_MDEG,
+                    position[4] * _RAD_TO_MDEG,
+                    position[5] * _RAD_TO_MDEG,
                 )
             
-            elif event["id"] == "action_gripper":
+            elif event_id == "action_gripper":
                 # Do not push to many commands to fast. Limiting it to 30Hz
-                if time.time() - elapsed_time > 0.03:
-                    elapsed_time = time.time()
-                else:
+                now_ns = time.monotonic_ns()
+                if now_ns < next_cmd_ns["action_gripper"]:
                     continue
+                next_cmd_ns["action_gripper"] = now_ns + _CMD_PERIOD_NS
 
                 position = event["value"].to_numpy()
-                piper.GripperCtrl(int(abs(position[0] * 1000 * 1000)), 1000, 0x01, 0)
+                piper.GripperCtrl(int(abs(position[0] * _M_TO_UM)), 1000, 0x01, 0)
+
+            elif event_id == "tick":
+                send_pending_joint()
 
-            elif event["id"] == "tick":
                 # Slave Arm
                 joint = piper.GetArmJointMsgs()
 
-                joint_value = []
-                joint_value += [joint.joint_state.joint_1.real / factor]
-                joint_value += [joint.joint_state.joint_2.real / factor]
-                joint_value += [joint.joint_state.joint_3.real / factor]
-                joint_value += [joint.joint_state.joint_4.real / factor]
-                joint_value += [joint.joint_state.joint_5.real / factor]
-                joint_value += [joint.joint_state.joint_6.real / factor]
+                js = joint.joint_state
+                slave_joint[0] = js.joint_1.real * _MDEG_TO_RAD
+                slave_joint[1] = js.joint_2.real * _MDEG_TO_RAD
+                slave_joint[2] = js.joint_3.real * _MDEG_TO_RAD
+                slave_joint[3] = js.joint_4.real * _MDEG_TO_RAD
+                slave_joint[4] = js.joint_5.real * _MDEG_TO_RAD
+                slave_joint[5] = js.joint_6.real * _MDEG_TO_RAD
 
                 gripper = piper.GetArmGripperMsgs()
-                joint_value += [gripper.gripper_state.grippers_angle / 1000 / 1000]
+                slave_joint[6] = gripper.gripper_state.grippers_angle * _UM_TO_M
 
-                node.send_output("slave_jointstate", pa.array(joint_value, type=pa.float32()))
+                node.send_output("slave_jointstate", pa.array(slave_joint))
 
                 position = piper.GetArmEndPoseMsgs()
-                position_value = []
-                position_value += [position.end_pose.X_axis * 0.001 * 0.001]
-                position_value += [position.end_pose.Y_axis * 0.001 * 0.001]
-                position_value += [position.end_pose.Z_axis * 0.001 * 0.001]
-                position_value += [position.end_pose.RX_axis * 0.001 / 360 * 2 * np.pi]
-                position_value += [position.end_pose.RY_axis * 0.001 / 360 * 2 * np.pi]
-                position_value += [position.end_pose.RZ_axis * 0.001 / 360 * 2 * np.pi]
-
-                node.send_output("slave_endpose", pa.array(position_value, type=pa.float32()))
+                ep = position.end_pose
+                slave_pose[0] = ep.X_axis * _UM_TO_M
+                slave_pose[1] = ep.Y_axis * _UM_TO_M
+                slave_pose[2] = ep.Z_axis * _UM_TO_M
+                slave_pose[3] = ep.RX_axis * _MDEG_TO_RAD
+                slave_pose[4] = ep.RY_axis * _MDEG_TO_RAD
+                slave_pose[5] = ep.RZ_axis * _MDEG_TO_RAD
+
+                node.send_output("slave_endpose", pa.array(slave_pose))
                 # node.send_output(
                 #     "slave_gripper",
                 #     pa.array(
@@ -170,18 +221,18 @@ def main():
                 # Master Arm
                 joint = piper.GetArmJointCtrl()
 
-                joint_value = []
-                joint_value += [joint.joint_ctrl.joint_1.real / factor]
-                joint_value += [joint.joint_ctrl.joint_2.real / factor]
-                joint_value += [joint.joint_ctrl.joint_3.real / factor]
-                joint_value += [joint.joint_ctrl.joint_4.real / factor]
-                joint_value += [joint.joint_ctrl.joint_5.real / factor]
-                joint_value += [joint.joint_ctrl.joint_6.real / factor]
+                jc = joint.joint_ctrl
+                master_joint[0] = jc.joint_1.real * _MDEG_TO_RAD
+                master_joint[1] = jc.joint_2.real * _MDEG_TO_RAD
+                master_joint[2] = jc.joint_3.real * _MDEG_TO_RAD
+                master_joint[3] = jc.joint_4.real * _MDEG_TO_RAD
+                master_joint[4] = jc.joint_5.real * _MDEG_TO_RAD
+                master_joint[5] = jc.joint_6.real * _MDEG_TO_RAD
 
                 gripper = piper.GetArmGripperCtrl()
-                joint_value += [gripper.gripper_ctrl.grippers_angle / 1000 / 1000]
+                master_joint[6] = gripper.gripper_ctrl.grippers_angle * _UM_TO_M
 
-                node.send_output("master_jointstate", pa.array(joint_value, type=pa.float32()))
+                node.send_output("master_jointstate", pa.array(master_joint))
 
                 # position = piper.GetFK(mode="control")
                 # position_value = []
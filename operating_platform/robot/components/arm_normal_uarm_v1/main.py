@@ -46,6 +46,11 @@ CALIBRATION_DIR = os.getenv("CALIBRATION_DIR", "./.calibration/")
 USE_DEGRESS = os.getenv("USE_DEGRESS", "True")
 ARM_ROLE = os.getenv("ARM_ROLE", "leader")
 SERVO_TYPE = os.getenv("SERVO_TYPE", "zhonglin")  # feetech or zhonglin
+# Pause between background position reads (zhonglin), keeping the servo bus free for commands
+READ_PERIOD_S = float(os.getenv("READ_PERIOD_S", "0.02"))
+
+# Resolved once at import; the node never changes its working directory
+_CALIBRATION_PATH = Path(CALIBRATION_DIR).resolve()
 
 
 def env_to_bool(env_value: str, default: bool = True) -> bool:
@@ -83,9 +88,10 @@ def main():
     node = Node()
 
     use_degrees = env_to_bool(USE_DEGRESS)
-    calibration_dir = Path(CALIBRATION_DIR).resolve()
+    calibration_dir = _CALIBRATION_PATH
     # Ensure calibration directory exists
-    calibration_dir.mkdir(parents=True, exist_ok=True)
+    if not calibration_dir.exists():
+        calibration_dir.mkdir(parents=True, exist_ok=True)
     
     calibration_fpath = calibration_dir / f"{ARM_NAME}.json"
     name = ARM_NAME
@@ -167,45 +173,46 @@ def main():
         start_pos = arm_bus.sync_read("Present_Position")
         print(f"[{ARM_NAME}] Start positions (zero reference): {start_pos}")
 
+    # Output order: joint_1, joint_2, ..., joint_6, gripper
+    motor_order = ("joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6", "gripper")
+    # Software zeroing reference (all zeros when not a leader)
+    zero_vec = np.array([start_pos.get(n, 0.0) if start_pos else 0.0 for n in motor_order], dtype=np.float32)
+
+    # Per-motor gains applied to the zeroed reading, resolved once up front:
+    # - joints: degrees to radians, or -100..100 mapped to -pi/2..pi/2 when not using degrees
+    # - gripper: mapped to meters (the Piper gripper range is approx 0 to 0.05m). Feetech
+    #   reports 0-100 (MotorNormMode.RANGE_0_100); Zhonglin reports degrees (approx 0-270),
+    #   of which 0-180 is clipped and mapped to 0-0.05m
+    if use_degrees or (SERVO_TYPE == "feetech" and norm_mode_body == MotorNormMode.DEGREES):
+        joint_gain = np.pi / 180.0
+    else:
+        joint_gain = (np.pi / 2.0) / 100.0
+    # Gripper (clip range, full-scale) per servo type; Feetech readings are not clipped
+    gripper_lo, gripper_hi, gripper_full = (
+        (-np.inf, np.inf, 100.0) if SERVO_TYPE == "feetech" else (0.0, 180.0, 180.0)
+    )
+    gains = np.array([joint_gain] * 6 + [0.05 / gripper_full], dtype=np.float32)
+    clip_lo = np.array([-np.inf] * 6 + [gripper_lo], dtype=np.float32)
+    clip_hi = np.array([np.inf] * 6 + [gripper_hi], dtype=np.float32)
+
+    if SERVO_TYPE == "feetech":
+        def read_positions() -> np.ndarray:
+            present_pos = arm_bus.sync_read("Present_Position")
+            return np.fromiter((present_pos[n] for n in motor_order), dtype=np.float32, count=len(motor_order))
+    else:
+        # Poll the servos on the driver's own thread so the UART wait overlaps with event
+        # handling; motors_config is declared in motor_order, so its array lines up directly
+        arm_bus.start_background_read(READ_PERIOD_S)
+        read_positions = arm_bus.latest_positions
+
     for event in node:
         if event["type"] == "INPUT":
             if event["id"] == "get_joint":
-                joint_value = []
-                present_pos = arm_bus.sync_read("Present_Position")
-                # present_pos is a dict {motor_name: value}
-                # Order matters: joint_1, joint_2, ..., joint_6, gripper
-                for motor_name in ["joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6", "gripper"]:
-                    val = present_pos[motor_name]
-                    
-                    # Apply software zeroing if leader
-                    if start_pos and motor_name in start_pos:
-                        val = val - start_pos[motor_name]
-
-                    if motor_name == "gripper":
-                        # Map gripper value to meters (e.g. 0 to 0.05)
-                        # The Piper gripper range is approx 0 to 0.05m
-                        if SERVO_TYPE == "feetech":
-                            # Feetech range 0-100 (MotorNormMode.RANGE_0_100)
-                            # However, if we zeroed it, val is relative to start.
-                            # If start was "opened" (e.g. 100), then current 100 -> 0.
-                            # Usually for leader we want 0 to be "as is" and positive to be "closing".
-                            # Let's just normalize to 0.05m based on range.
-                            val = (val / 100.0) * 0.05
-                        else:
-                            # Zhonglin degrees (approx 0-270)
-                            # Let's map 0-180 degrees to 0-0.05m
-                            val = np.clip(val, 0, 180) / 180.0 * 0.05
-                    else:
-                        # Convert degrees to radians
-                        if use_degrees or (SERVO_TYPE == "feetech" and norm_mode_body == MotorNormMode.DEGREES):
-                            val = np.deg2rad(val)
-                        else:
-                            # If not using degrees, assume -100 to 100 range and map to -pi/2 to pi/2
-                            val = (val / 100.0) * (np.pi / 2.0)
-                    
-                    joint_value.append(val)
-
-                node.send_output("joint", pa.array(joint_value, type=pa.float32()))
+                vals = read_positions() - zero_vec
+                np.clip(vals, clip_lo, clip_hi, out=vals)
+                vals *= gains
+
+                node.send_output("joint", pa.array(vals))
 
         elif event["type"] == "STOP":
             print(f"[{ARM_NAME}] Received STOP event, cleaning up...")
@@ -1,4 +1,7 @@
+import os
+import select
 import serial
+import threading
 import time
 import re
 import numpy as np
@@ -19,6 +22,10 @@ class ZhonglinMotorsBus:
     model_number_table = {"zhonglin": 0}
     model_resolution_table = {"zhonglin": 4096}
 
+    _PWM_RE = re.compile(rb'P(\d{4})')
+    # Consecutive serial errors after which the background reader gives up
+    _MAX_READ_FAILURES = 10
+
     def __init__(
         self,
         port: str,
@@ -31,12 +38,33 @@ class ZhonglinMotorsBus:
         self.calibration = calibration if calibration else {}
         self.baudrate = baudrate
         self.ser = None
+        self._fd = None
+        # Serializes query/reply exchanges between the background reader and other callers
+        self._bus_lock = threading.Lock()
         self.zero_angles = {name: 0.0 for name in motors}
+        # Position queries that got no usable reply and were read as 0.0
+        self.read_misses = 0
+        self._order = tuple(motors)
+        self._positions = np.zeros(len(self._order), dtype=np.float32)
+        # Background polling (see start_background_read)
+        self._reader = None
+        self._read_period_s = 0.02
+        self._stop_reader = threading.Event()
+        self._latest_ready = threading.Event()
+        self._latest_lock = threading.Lock()
+        self._latest = np.zeros(len(self._order), dtype=np.float32)
+        self._reader_error = None
         self.is_connected = False
 
     def connect(self, handshake: bool = True):
         try:
-            self.ser = serial.Serial(self.port, self.baudrate, timeout=0.1)
+            # Short timeouts: replies are a few bytes and arrive within ~1ms at 115200
+            self.ser = serial.Serial(self.port, self.baudrate, timeout=0.02, inter_byte_timeout=0.002)
+            # Raw fd for the hot path; None on platforms without one (falls back to pyserial)
+            try:
+                self._fd = self.ser.fileno()
+            except (AttributeError, OSError):
+                self._fd = None
             self.is_connected = True
             print(f"[Zhonglin] Serial port {self.port} opened at {self.baudrate}")
             self._init_servos()
@@ -45,24 +73,42 @@ class ZhonglinMotorsBus:
             raise e
 
     def disconnect(self, disable_torque: bool = False):
+        self.stop_background_read()
         if self.ser:
             self.ser.close()
             self.ser = None
+            self._fd = None
             self.is_connected = False
             print(f"[Zhonglin] Serial port {self.port} closed")
 
-    def send_command(self, cmd: str) -> str:
+    def send_command(self, cmd: str) -> bytes:
         if not self.ser:
-            return ""
-        self.ser.write(cmd.encode('ascii'))
-        time.sleep(0.008)
-        return self.ser.read_all().decode('ascii', errors='ignore')
-
-    def pwm_to_angle(self, response_str: str, pwm_min=500, pwm_max=2500, angle_range=270) -> float:
-        match = re.search(r'P(\d{4})', response_str)
-        if not match:
-            return None
-        pwm_val = int(match.group(1))
+            return b""
+        with self._bus_lock:
+            self.ser.reset_input_buffer()
+            self._write(cmd.encode('ascii'))
+            # Replies are '!'-terminated; return as soon as one is complete instead of sleeping
+            return self._read_replies(1, timeout=0.02)
+
+    def _write(self, data: bytes):
+        if self._fd is None:
+            self.ser.write(data)
+            return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+
+    def pwm_to_angle(self, response: bytes, pwm_min=500, pwm_max=2500, angle_range=270) -> float:
+        # Fast path for the fixed "#NNNPXXXX!" reply shape, regex for anything else
+        i = response.find(b'P')
+        digits = response[i + 1:i + 5] if i >= 0 else b''
+        if len(digits) == 4 and digits.isdigit():
+            pwm_val = int(digits)
+        else:
+            match = self._PWM_RE.search(response)
+            if not match:
+                return None
+            pwm_val = int(match.group(1))
         pwm_span = pwm_max - pwm_min
         angle = (pwm_val - pwm_min) / pwm_span * angle_range
         return angle
@@ -76,24 +122,136 @@ class ZhonglinMotorsBus:
             self.send_command(f'#{motor.id:03d}PULK!')
             # Test read to ensure connectivity
             response = self.send_command(f'#{motor.id:03d}PRAD!')
-            angle = self.pwm_to_angle(response.strip())
+            angle = self.pwm_to_angle(response)
             if angle is None:
                 print(f"[Zhonglin] Warning: Could not read from motor {name} (ID: {motor.id})")
         print(f"[Zhonglin] Servo initialization completed.")
 
+    def _read_replies(self, count: int, timeout: float = 0.05) -> bytes:
+        """Read until `count` '!'-terminated replies have arrived or `timeout` expires."""
+        buf = bytearray()
+        deadline = time.monotonic() + timeout
+        while buf.count(b'!') < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._fd is None:
+                buf += self.ser.read(self.ser.in_waiting or 1)
+                continue
+            # Wait on the fd directly instead of going through pyserial's read/in_waiting
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                break
+            chunk = os.read(self._fd, 64)
+            if not chunk:
+                break
+            buf += chunk
+        return bytes(buf)
+
+    def _read_positions(self, names, out) -> None:
+        """Read the present angle of each motor in `names` into `out[i]` (0.0 on error)."""
+        if not self.ser:
+            out[:] = [0.0] * len(names)
+            return
+
+        # One query/reply at a time: the servos share a half-duplex single-wire bus,
+        # so queries are never queued behind replies. send_command returns as soon
+        # as the reply is complete instead of sleeping a fixed time per motor
+        for i, name in enumerate(names):
+            motor = self.motors[name]
+            angle = self.pwm_to_angle(self.send_command(f'#{motor.id:03d}PRAD!'))
+            if angle is None:
+                self.read_misses += 1
+                if self.read_misses == 1 or self.read_misses % 100 == 0:
+                    print(f"[Zhonglin] No reply from motor {name} (ID: {motor.id}), "
+                          f"using 0.0 ({self.read_misses} missed reads so far)")
+                angle = 0.0  # Error fallback
+            out[i] = angle
+
+    def sync_read_array(self) -> np.ndarray:
+        """
+        Read present positions of all motors, ordered like `self.motors`.
+
+        Returns a float32 array that is reused (overwritten) by the next call.
+        """
+        self._read_positions(self._order, self._positions)
+        return self._positions
+
     def sync_read(self, register: str, motors: list[str] = None) -> Dict[str, float]:
         """Read present positions. register argument is ignored as Zhonglin has fixed protocol."""
-        results = {}
-        target_motors = motors if motors else self.motors.keys()
-        for name in target_motors:
-            motor = self.motors[name]
-            response = self.send_command(f'#{motor.id:03d}PRAD!')
-            angle = self.pwm_to_angle(response.strip())
-            if angle is not None:
-                results[name] = angle
-            else:
-                results[name] = 0.0 # Error fallback
-        return results
+        target_motors = list(motors) if motors else list(self.motors)
+        values = [0.0] * len(target_motors)
+        self._read_positions(target_motors, values)
+        return dict(zip(target_motors, values))
+
+    def start_background_read(self, period_s: float = 0.02):
+        """
+        Poll all positions on a daemon thread, pausing `period_s` seconds between full reads.
+
+        Read positions with `latest_positions()` instead of `sync_read`/`sync_read_array`.
+        Other commands may still be sent meanwhile; they take turns on the bus with the
+        reader's queries and go through during the pause between reads.
+        """
+        if self._reader is not None:
+            return
+        self._read_period_s = period_s
+        self._stop_reader.clear()
+        self._latest_ready.clear()
+        self._reader_error = None
+        self._reader = threading.Thread(
+            target=self._background_read_loop, name=f"zhonglin-{self.port}", daemon=True
+        )
+        self._reader.start()
+
+    def stop_background_read(self):
+        if self._reader is None:
+            return
+        self._stop_reader.set()
+        self._reader.join(timeout=1.0)
+        self._reader = None
+
+    def _background_read_loop(self):
+        buf = np.zeros(len(self._order), dtype=np.float32)
+        failures = 0
+        try:
+            while not self._stop_reader.is_set():
+                try:
+                    self._read_positions(self._order, buf)
+                except OSError as e:
+                    # Transient serial errors are retried; a port that keeps failing is gone
+                    failures += 1
+                    if failures >= self._MAX_READ_FAILURES:
+                        raise
+                    print(f"[Zhonglin] Background read failed: {e}")
+                    self._stop_reader.wait(0.1)
+                    continue
+                failures = 0
+                with self._latest_lock:
+                    self._latest[:] = buf
+                self._latest_ready.set()
+                # Leave the bus idle between reads for other commands
+                self._stop_reader.wait(self._read_period_s)
+        except Exception as e:
+            print(f"[Zhonglin] Background read stopped: {e}")
+            self._reader_error = e
+        finally:
+            # Never let latest_positions() serve values from a reader that has exited
+            self._latest_ready.clear()
+
+    def latest_positions(self) -> np.ndarray:
+        """
+        Return a copy of the newest background-polled positions, ordered like `self.motors`.
+
+        Blocks until the first poll has completed. Raises the reader's exception
+        if the background reader died.
+        """
+        while not self._latest_ready.wait(timeout=0.1):
+            if self._reader_error is not None:
+                raise self._reader_error
+            if self._reader is None or not self._reader.is_alive():
+                raise RuntimeError("[Zhonglin] Background read is not running")
+        with self._latest_lock:
+            return self._latest.copy()
 
     def sync_write(self, register: str, values: Dict[str, float]):
         """Write goal positions. Not typically used for passive leader arms, but implemented for compatibility."""
@@ -38,7 +38,9 @@ context = zmq.Context()
 
 socket_image = context.socket(zmq.PAIR)
 socket_image.bind(ipc_address_image)
-socket_image.setsockopt(zmq.SNDHWM, 2000)
+# Keep few frames queued: sends are NOBLOCK, so a slow reader drops frames instead of
+# receiving ones that are seconds old
+socket_image.setsockopt(zmq.SNDHWM, 4)
 socket_image.setsockopt(zmq.SNDBUF, 2**25)
 socket_image.setsockopt(zmq.SNDTIMEO, 2000)
 socket_image.setsockopt(zmq.RCVTIMEO, 2000)
@@ -46,7 +48,9 @@ socket_image.setsockopt(zmq.LINGER, 0)
 
 socket_joint = context.socket(zmq.PAIR)
 socket_joint.bind(ipc_address_joint)
-socket_joint.setsockopt(zmq.SNDHWM, 2000)
+# Same for joints; the reader only keeps the newest vector per event id, and this
+# socket carries a few joint streams interleaved, so allow a few messages for each
+socket_joint.setsockopt(zmq.SNDHWM, 16)
 socket_joint.setsockopt(zmq.SNDBUF, 2**25)
 socket_joint.setsockopt(zmq.SNDTIMEO, 2000)
 socket_joint.setsockopt(zmq.RCVTIMEO, 2000)
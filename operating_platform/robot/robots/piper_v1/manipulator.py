@@ -31,12 +31,13 @@ from operating_platform.robot.robots.camera import Camera
 ipc_address_image = "ipc:///tmp/dora-zeromq-piper-image"
 ipc_address_joint = "ipc:///tmp/dora-zeromq-piper-joint"
 
+# Latest frame / joint vector per event id. Receivers publish by storing a freshly
+# allocated array under its key (a single, GIL-atomic dict store) and never mutate it
+# afterwards, so readers can take a reference without locking.
 recv_images = {}
 recv_joint = {}
-lock = threading.Lock()  # 线程锁
 
-running_recv_image_server = True
-running_recv_joint_server = True
+running_recv_server = True
 
 # Connection state tracking
 _image_connected = False
@@ -48,6 +49,16 @@ socket_image = None
 socket_joint = None
 _zmq_initialized = False
 
+# Compressed frames are decoded off the receiver thread (cv2.imdecode releases the GIL),
+# so the image socket keeps draining while frames decode in parallel
+_COMPRESSED_ENCODINGS = ("jpeg", "jpg", "jpe", "bmp", "webp", "png")
+_MAX_DECODES_IN_FLIGHT = 2  # per camera; newer frames are dropped beyond this
+decode_pool = None
+_decode_lock = threading.Lock()
+_decode_seq = {}  # event_id -> sequence number of the last submitted frame
+_decode_inflight = {}  # event_id -> frames submitted but not yet decoded
+_published_seq = {}  # event_id -> sequence number of the frame in recv_images
+
 
 def _init_zmq():
     """Initialize ZeroMQ sockets (lazy initialization)."""
@@ -58,11 +69,18 @@ def _init_zmq():
 
     zmq_context = zmq.Context()
 
+    # Only the newest frame / joint vector is ever used, so keep the receive queues short:
+    # a backlog only adds latency. (ZMQ_CONFLATE would be ideal but does not support
+    # PAIR sockets or multipart messages.)
     socket_image = zmq_context.socket(zmq.PAIR)
+    socket_image.setsockopt(zmq.RCVHWM, 4)
+    socket_image.setsockopt(zmq.LINGER, 0)
     socket_image.connect(ipc_address_image)
     socket_image.setsockopt(zmq.RCVTIMEO, 2000)
 
     socket_joint = zmq_context.socket(zmq.PAIR)
+    socket_joint.setsockopt(zmq.RCVHWM, 4)  # leader and follower share this socket
+    socket_joint.setsockopt(zmq.LINGER, 0)
     socket_joint.connect(ipc_address_joint)
     socket_joint.setsockopt(zmq.RCVTIMEO, 2000)
 
@@ -70,6 +88,71 @@ def _init_zmq():
     print("[PiperV1] ZeroMQ sockets initialized")
 
 
+# Event ids are a handful of fixed tokens; decode each once and reuse the str
+_event_id_cache: dict[bytes, str] = {}
+
+
+def _event_id(raw: bytes) -> str:
+    event_id = _event_id_cache.get(raw)
+    if event_id is None:
+        event_id = _event_id_cache[raw] = raw.decode('utf-8')
+    return event_id
+
+
+def _start_decode_pool(max_workers: int):
+    global decode_pool
+    if decode_pool is None:
+        decode_pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="piper-decode")
+
+
+def _stop_decode_pool():
+    global decode_pool
+    if decode_pool is not None:
+        decode_pool.shutdown(wait=False, cancel_futures=True)
+        decode_pool = None
+    with _decode_lock:
+        _decode_seq.clear()
+        _decode_inflight.clear()
+        _published_seq.clear()
+
+
+def _decode_and_publish(event_id, seq, img_array):
+    try:
+        frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+        if frame is None:
+            return
+        # imdecode already allocated the frame; swap channels in place
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+        with _decode_lock:
+            # Workers can finish out of order; never replace a newer frame with an older one
+            if seq > _published_seq.get(event_id, -1):
+                _published_seq[event_id] = seq
+                recv_images[event_id] = frame
+    except Exception as e:
+        print("[PiperV1] decode image error:", e)
+    finally:
+        with _decode_lock:
+            _decode_inflight[event_id] = _decode_inflight.get(event_id, 1) - 1
+
+
+def _submit_decode(event_id, img_array):
+    pool = decode_pool
+    if pool is None:
+        return
+    with _decode_lock:
+        if _decode_inflight.get(event_id, 0) >= _MAX_DECODES_IN_FLIGHT:
+            return  # Decoders are behind; drop rather than queue stale frames
+        seq = _decode_seq.get(event_id, -1) + 1
+        _decode_seq[event_id] = seq
+        _decode_inflight[event_id] = _decode_inflight.get(event_id, 0) + 1
+    try:
+        pool.submit(_decode_and_publish, event_id, seq, img_array)
+    except RuntimeError:
+        # Pool shut down by disconnect()
+        with _decode_lock:
+            _decode_inflight[event_id] = _decode_inflight.get(event_id, 1) - 1
+
+
 def _cleanup_zmq():
     """Clean up ZeroMQ sockets and context."""
     global zmq_context, socket_image, socket_joint, _zmq_initialized
@@ -108,98 +191,100 @@ def piper_zmq_send(event_id, buffer, wait_time_s):
         pass
     time.sleep(wait_time_s)
 
-def recv_image_server():
-    """接收数据线程"""
+def _handle_image(message_parts):
     global _image_connected
-    while running_recv_image_server:
-        if socket_image is None:
-            time.sleep(0.1)
-            continue
-        try:
-            message_parts = socket_image.recv_multipart()
-            if len(message_parts) < 2:
-                continue  # 协议错误
-
-            event_id = message_parts[0].decode('utf-8')
-            buffer_bytes = message_parts[1]
-            metadata = json.loads(message_parts[2].decode('utf-8'))
-
-            # Mark as connected on first successful receive
-            if not _image_connected:
-                _image_connected = True
-                print("[PiperV1] Camera data stream connected")
-
-            if 'image' in event_id:
-                # 解码图像
-                img_array = np.frombuffer(buffer_bytes, dtype=np.uint8)
-                encoding = metadata["encoding"].lower()
-                width = metadata["width"]
-                height = metadata["height"]
-
-                if encoding == "bgr8":
-                    channels = 3
-                    frame = (
-                        img_array.reshape((height, width, channels))
-                        .copy()  # Copy So that we can add annotation on the image
-                    )
-                elif encoding == "rgb8":
-                    channels = 3
-                    frame = (img_array.reshape((height, width, channels)))
-                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-
-                elif encoding in ["jpeg", "jpg", "jpe", "bmp", "webp", "png"]:
-                    channels = 3
-                    frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                if frame is not None:
-                    with lock:
-                        # print(f"Received event_id = {event_id}")
-                        recv_images[event_id] = frame
-
-        except zmq.Again:
-            # Timeout waiting for data, silently continue
-            continue
-        except Exception as e:
-            print("[PiperV1] recv image error:", e)
-            break
-
-
-def recv_joint_server():
-    """接收数据线程"""
+    if len(message_parts) < 2:
+        return  # 协议错误
+
+    event_id = _event_id(message_parts[0].bytes)
+    buffer_bytes = message_parts[1].buffer
+    metadata = json.loads(message_parts[2].bytes)
+
+    # Mark as connected on first successful receive
+    if not _image_connected:
+        _image_connected = True
+        print("[PiperV1] Camera data stream connected")
+
+    if 'image' in event_id:
+        # 解码图像
+        img_array = np.frombuffer(buffer_bytes, dtype=np.uint8)
+        encoding = metadata["encoding"].lower()
+        width = metadata["width"]
+        height = metadata["height"]
+
+        # Frames are published as RGB. Each branch makes exactly one full pass over
+        # the pixels into a fresh array: consumers keep references to published
+        # frames (e.g. queued for saving), so buffers are never reused.
+        frame = None
+        if encoding == "bgr8":
+            channels = 3
+            # cvtColor reads the receive buffer directly and writes a fresh, writable RGB
+            # array, so no separate copy is needed first
+            frame = cv2.cvtColor(img_array.reshape((height, width, channels)), cv2.COLOR_BGR2RGB)
+        elif encoding == "rgb8":
+            # Already RGB: one copy (the receive buffer is read-only)
+            channels = 3
+            frame = img_array.reshape((height, width, channels)).copy()
+
+        elif encoding in _COMPRESSED_ENCODINGS:
+            # Published by the decode pool
+            _submit_decode(event_id, img_array)
+
+        if frame is not None:
+            # print(f"Received event_id = {event_id}")
+            recv_images[event_id] = frame
+
+
+def _handle_joint(message_parts):
     global _joint_connected
-    while running_recv_joint_server:
-        if socket_joint is None:
+    if len(message_parts) < 2:
+        return  # 协议错误
+
+    event_id = _event_id(message_parts[0])
+    buffer_bytes = message_parts[1]
+
+    # Mark as connected on first successful receive
+    if not _joint_connected:
+        _joint_connected = True
+        print("[PiperV1] Joint data stream connected")
+
+    if 'joint' in event_id:
+        joint_array = np.frombuffer(buffer_bytes, dtype=np.float32)
+        if joint_array is not None:
+            # print(f"Received pose data for event_id: {event_id}")
+            recv_joint[event_id] = joint_array
+
+
+def recv_server():
+    """接收数据线程: a single thread drains both sockets through one zmq.Poller"""
+    poller = None
+    registered = None
+    while running_recv_server:
+        sockets = (socket_image, socket_joint)
+        if None in sockets:
             time.sleep(0.1)
             continue
+        if sockets != registered:
+            poller = zmq.Poller()
+            poller.register(socket_image, zmq.POLLIN)
+            poller.register(socket_joint, zmq.POLLIN)
+            registered = sockets
         try:
-            message_parts = socket_joint.recv_multipart()
-            if len(message_parts) < 2:
-                continue  # 协议错误
-
-            event_id = message_parts[0].decode('utf-8')
-            buffer_bytes = message_parts[1]
-
-            # Mark as connected on first successful receive
-            if not _joint_connected:
-                _joint_connected = True
-                print("[PiperV1] Joint data stream connected")
-
-            if 'joint' in event_id:
-                joint_array = np.frombuffer(buffer_bytes, dtype=np.float32)
-                if joint_array is not None:
-                    # print(f"Received pose data for event_id: {event_id}")
-                    with lock:
-                        recv_joint[event_id] = joint_array
-
+            for sock, _ in poller.poll(100):
+                if sock is socket_image:
+                    # copy=False: frames arrive as zmq.Frame, and the pixel payload is read
+                    # through a memoryview instead of being copied into a new bytes object first
+                    _handle_image(sock.recv_multipart(flags=zmq.NOBLOCK, copy=False))
+                else:
+                    _handle_joint(sock.recv_multipart(flags=zmq.NOBLOCK))
         except zmq.Again:
-            # Timeout waiting for data, silently continue
             continue
-        except Exception as e:
-            print("[PiperV1] recv joint error:", e)
+        except zmq.ZMQError as e:
+            print("[PiperV1] recv error:", e)
             break
-
+        except Exception as e:
+            # Malformed message; keep serving the other stream
+            print("[PiperV1] recv message error:", e)
 
 
 class OpenCVCamera:
@@ -268,11 +353,29 @@ class PiperV1Manipulator:
         self.cameras = make_cameras_from_configs(self.config.cameras)
         self.connect_excluded_cameras = []
 
-        self.recv_image_thread = threading.Thread(target=recv_image_server, daemon=True)
-        self.recv_image_thread.start()
+        # Per-arm "<arm>_<motor>.pos" keys with their 0-based index in the joint vector
+        # (motors[...][0] is 1-based), built once instead of formatted on every step
+        self._follower_pos_keys = {
+            name: [(f"{name}_{motor}.pos", value[0] - 1) for motor, value in arm.motors.items()]
+            for name, arm in self.follower_arms.items()
+        }
+        self._leader_pos_keys = {
+            name: [(f"{name}_{motor}.pos", value[0] - 1) for motor, value in arm.motors.items()]
+            for name, arm in self.leader_arms.items()
+        }
+        # send_action builds the follower goal vector in motor-index order
+        self._follower_goal_keys = {
+            name: [key for key, _ in sorted(keys, key=lambda k: k[1])]
+            for name, keys in self._follower_pos_keys.items()
+        }
+        self._follower_log_keys = {name: f"read_follower_{name}_joint_dt_s" for name in self.follower_arms}
+        self._leader_log_keys = {name: f"read_leader_{name}_joint_dt_s" for name in self.leader_arms}
+        self._camera_log_keys = {name: f"read_camera_{name}_dt_s" for name in self.cameras}
+
+        _start_decode_pool(len(self.cameras))
 
-        self.recv_joint_thread = threading.Thread(target=recv_joint_server, daemon=True)
-        self.recv_joint_thread.start()
+        self.recv_thread = threading.Thread(target=recv_server, daemon=True)
+        self.recv_thread.start()
 
         self.is_connected = False
         self.logs = {}
@@ -302,7 +405,9 @@ class PiperV1Manipulator:
     def action_features(self) -> dict[str, type]:
         return self._leader_motors_ft
 
-    @property
+    # The feature dicts below only depend on the arm/camera config fixed in __init__, so
+    # they are built once; callers must not mutate them
+    @cached_property
     def camera_features(self) -> dict:
         cam_ft = {}
         for cam_key, cam in self.cameras.items():
@@ -314,7 +419,7 @@ class PiperV1Manipulator:
             }
         return cam_ft
     
-    @property
+    @cached_property
     def microphone_features(self) -> dict:
         mic_ft = {}
         for mic_key, mic in self.microphones.items():
@@ -326,7 +431,7 @@ class PiperV1Manipulator:
             }
         return mic_ft
     
-    @property
+    @cached_property
     def motor_features(self) -> dict:
         action_names = self.get_motor_names(self.leader_arms)
         state_names = self.get_motor_names(self.follower_arms)
@@ -464,7 +569,7 @@ class PiperV1Manipulator:
 
         self.is_connected = True
     
-    @property
+    @cached_property
     def features(self):
         return {**self.motor_features, **self.camera_features}
 
@@ -493,47 +598,37 @@ class PiperV1Manipulator:
             for match_name in recv_joint:
                 if name in match_name:
                     now = time.perf_counter()
-                    # Piper has 7 values: 6 joints + 1 gripper
-                    byte_array = np.zeros(7, dtype=np.float32)
-                    pose_read = recv_joint[match_name]
-                    byte_array[:7] = pose_read[:7]
-                    byte_array = np.round(byte_array, 4)
-                    follower_joint[name] = byte_array
-                    self.logs[f"read_follower_{name}_joint_dt_s"] = time.perf_counter() - now
+                    # Piper has 7 values: 6 joints + 1 gripper. np.round allocates the
+                    # result, so no staging copy of the received (read-only) array is needed
+                    follower_joint[name] = np.round(recv_joint[match_name][:7], 4)
+                    self.logs[self._follower_log_keys[name]] = time.perf_counter() - now
                     
         leader_joint = {}
         for name in self.leader_arms:
             for match_name in recv_joint:
                 if name in match_name:
                     now = time.perf_counter()
-                    byte_array = np.zeros(7, dtype=np.float32)
-                    pose_read = recv_joint[match_name]
-                    byte_array[:7] = pose_read[:7]
-                    byte_array = np.round(byte_array, 4)
-                    leader_joint[name] = byte_array
-                    self.logs[f"read_leader_{name}_joint_dt_s"] = time.perf_counter() - now
+                    leader_joint[name] = np.round(recv_joint[match_name][:7], 4)
+                    self.logs[self._leader_log_keys[name]] = time.perf_counter() - now
 
         obs_dict, action_dict = {}, {}
 
-        for name, arm in self.follower_arms.items():
+        # tolist() converts the whole vector to Python floats in one C call instead of
+        # boxing a numpy scalar per motor
+        for name, keys in self._follower_pos_keys.items():
             if name in follower_joint:
-                for motor, value in arm.motors.items():
-                    # value[0] is the index in the motor list (1-based)
-                    idx = value[0] - 1
-                    if idx < len(follower_joint[name]):
-                        obs_dict[f"{name}_{motor}.pos"] = follower_joint[name][idx]
+                joint = follower_joint[name].tolist()
+                obs_dict.update((key, joint[idx]) for key, idx in keys if idx < len(joint))
 
-        for name, arm in self.leader_arms.items():
+        for name, keys in self._leader_pos_keys.items():
             if name in leader_joint:
-                for motor, value in arm.motors.items():
-                    idx = value[0] - 1
-                    if idx < len(leader_joint[name]):
-                        action_dict[f"{name}_{motor}.pos"] = leader_joint[name][idx]
+                joint = leader_joint[name].tolist()
+                action_dict.update((key, joint[idx]) for key, idx in keys if idx < len(joint))
 
         for name in self.cameras:
             now = time.perf_counter()
-            obs_dict[f"{name}"] = recv_images[name]
-            self.logs[f"read_camera_{name}_dt_s"] = time.perf_counter() - now
+            obs_dict[name] = recv_images[name]
+            self.logs[self._camera_log_keys[name]] = time.perf_counter() - now
 
         return obs_dict, action_dict
 
@@ -545,19 +640,18 @@ class PiperV1Manipulator:
 
         obs_dict = {}
         # Fetch current follower state
-        for name, arm in self.follower_arms.items():
+        for name, keys in self._follower_pos_keys.items():
             for match_name in recv_joint:
                 if name in match_name:
                     pose_read = recv_joint[match_name]
-                    for motor, value in arm.motors.items():
-                        idx = value[0] - 1
+                    for key, idx in keys:
                         if idx < len(pose_read):
-                            obs_dict[f"{name}_{motor}.pos"] = pose_read[idx]
+                            obs_dict[key] = pose_read[idx]
 
         # Fetch current images
         for name in self.cameras:
             if name in recv_images:
-                obs_dict[f"{name}"] = recv_images[name]
+                obs_dict[name] = recv_images[name]
         
         return obs_dict
 
@@ -571,12 +665,9 @@ class PiperV1Manipulator:
             # Construct the action vector for the follower
             # We look for keys like 'main_follower_joint_1.pos', etc.
             goal_joint = []
-            arm_bus = self.follower_arms[name]
             
-            # Sort motors by their index to construct a consistent vector
-            sorted_motors = sorted(arm_bus.motors.items(), key=lambda x: x[1][0])
-            for motor_name, _ in sorted_motors:
-                key = f"{name}_{motor_name}.pos"
+            # Motors sorted by their index to construct a consistent vector
+            for key in self._follower_goal_keys[name]:
                 if key in action:
                     val = action[key]
                     if isinstance(val, (torch.Tensor, np.ndarray)):
@@ -597,17 +688,14 @@ class PiperV1Manipulator:
         print("[PiperV1] Disconnecting robot...")
         self.is_connected = False
 
-        global running_recv_image_server
-        global running_recv_joint_server
-        running_recv_image_server = False
-        running_recv_joint_server = False
+        global running_recv_server
+        running_recv_server = False
 
-        if self.recv_image_thread.is_alive():
-            self.recv_image_thread.join(timeout=3.0)
-        if self.recv_joint_thread.is_alive():
-            self.recv_joint_thread.join(timeout=3.0)
+        if self.recv_thread.is_alive():
+            self.recv_thread.join(timeout=3.0)
 
         _cleanup_zmq()
+        _stop_decode_pool()
 
         recv_images.clear()
         recv_joint.clear()
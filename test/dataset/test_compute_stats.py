@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Unit tests for dataset statistics (operating_platform/dataset/compute_stats.py).
+
+The optimized code paths are checked against straightforward reference
+implementations of the previous behavior.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image as PILImage
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from operating_platform.dataset.compute_stats import (
+    aggregate_feature_stats,
+    aggregate_stats,
+    auto_downsample_height_width,
+    get_feature_stats,
+    get_image_stats,
+    sample_images,
+    sample_indices,
+)
+
+
+def reference_load(path: str) -> np.ndarray:
+    """Full-resolution decode followed by strided downsampling"""
+    img = np.array(PILImage.open(path).convert("RGB"), dtype=np.uint8).transpose(2, 0, 1)
+    return auto_downsample_height_width(img)
+
+
+class TestSampleImages(unittest.TestCase):
+    """Test that sampled frames match a full decode + strided downsample."""
+
+    SIZES = [(1920, 1080), (1280, 720), (848, 480), (1000, 700), (640, 480), (200, 150)]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, width: int, height: int, ext: str, count: int = 3) -> list[str]:
+        paths = []
+        for i in range(count):
+            # Smooth gradient plus noise so JPEG blocks are not uniform
+            x = np.linspace(0, 255, width)[None, :, None]
+            y = np.linspace(0, 255, height)[:, None, None]
+            pixels = (x + y) / 2 + self.rng.normal(0, 20, (height, width, 3))
+            path = str(Path(self.tmpdir.name) / f"frame_{width}x{height}_{i}.{ext}")
+            PILImage.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(path)
+            paths.append(path)
+        return paths
+
+    def _check(self, ext: str):
+        for width, height in self.SIZES:
+            with self.subTest(size=(width, height)):
+                paths = self._write(width, height, ext)
+                expected = np.stack([reference_load(paths[i]) for i in sample_indices(len(paths))])
+                np.testing.assert_array_equal(sample_images(paths, num_workers=2), expected)
+
+    def test_jpeg_matches_full_decode(self):
+        self._check("jpg")
+
+    def test_png_matches_full_decode(self):
+        self._check("png")
+
+    def test_known_shapes(self):
+        expected = {(1920, 1080): (3, 90, 160), (848, 480): (3, 96, 170), (200, 150): (3, 150, 200)}
+        for (width, height), shape in expected.items():
+            with self.subTest(size=(width, height)):
+                self.assertEqual(sample_images(self._write(width, height, "jpg", count=1)).shape[1:], shape)
+
+
+class TestFeatureStats(unittest.TestCase):
+    """Test get_feature_stats against numpy's own reductions."""
+
+    def test_matches_numpy(self):
+        rng = np.random.default_rng(2)
+        for shape, axis, keepdims in [((50, 6), 0, False), ((50,), 0, True), ((4, 3, 5, 6), (0, 2, 3), True)]:
+            with self.subTest(shape=shape, axis=axis):
+                data = rng.normal(3.0, 2.0, size=shape)
+                stats = get_feature_stats(data, axis=axis, keepdims=keepdims)
+                np.testing.assert_allclose(stats["mean"], np.mean(data, axis=axis, keepdims=keepdims))
+                np.testing.assert_allclose(stats["std"], np.std(data, axis=axis, keepdims=keepdims))
+                np.testing.assert_array_equal(stats["min"], np.min(data, axis=axis, keepdims=keepdims))
+                np.testing.assert_array_equal(stats["max"], np.max(data, axis=axis, keepdims=keepdims))
+                np.testing.assert_array_equal(stats["count"], [len(data)])
+
+    def test_input_is_not_modified(self):
+        data = np.arange(12, dtype=np.float64).reshape(4, 3)
+        original = data.copy()
+        get_feature_stats(data, axis=0, keepdims=False)
+        np.testing.assert_array_equal(data, original)
+
+
+class TestImageStats(unittest.TestCase):
+    """Test the histogram-based image stats against the generic reduction."""
+
+    def _check(self, images: np.ndarray):
+        expected = get_feature_stats(images, axis=(0, 2, 3), keepdims=True)
+        actual = get_image_stats(images)
+        self.assertEqual(actual.keys(), expected.keys())
+        for key in ("min", "max", "count"):
+            np.testing.assert_array_equal(actual[key], expected[key], err_msg=key)
+        for key in ("mean", "std"):
+            self.assertEqual(actual[key].shape, expected[key].shape, key)
+            np.testing.assert_allclose(actual[key], expected[key], rtol=1e-10, atol=1e-9, err_msg=key)
+
+    def test_random_images(self):
+        rng = np.random.default_rng(0)
+        self._check(rng.integers(0, 256, size=(7, 3, 24, 32), dtype=np.uint8))
+
+    def test_narrow_value_range(self):
+        rng = np.random.default_rng(1)
+        images = rng.integers(40, 60, size=(5, 3, 10, 10), dtype=np.uint8)
+        images[:, 1] = 200  # constant channel: std 0, min == max
+        self._check(images)
+
+    def test_known_values(self):
+        images = np.zeros((2, 3, 1, 2), dtype=np.uint8)
+        images[0, 0] = [[0, 255]]
+        images[1, 0] = [[255, 255]]
+        stats = get_image_stats(images)
+        self.assertEqual(stats["min"][0, 0, 0, 0], 0)
+        self.assertEqual(stats["max"][0, 0, 0, 0], 255)
+        self.assertAlmostEqual(stats["mean"][0, 0, 0, 0], 191.25)
+        self.assertAlmostEqual(stats["std"][0, 0, 0, 0], np.std([0, 255, 255, 255]))
+        np.testing.assert_array_equal(stats["count"], [2])
+
+
+def reference_aggregate(stats_ft_list: list[dict]) -> dict:
+    """Previous aggregate_feature_stats: weighted sums over stacked episode stats"""
+    means = np.stack([s["mean"] for s in stats_ft_list])
+    variances = np.stack([s["std"] ** 2 for s in stats_ft_list])
+    counts = np.stack([s["count"] for s in stats_ft_list])
+    total_count = counts.sum(axis=0)
+    while counts.ndim < means.ndim:
+        counts = np.expand_dims(counts, axis=-1)
+    total_mean = (means * counts).sum(axis=0) / total_count
+    delta_means = means - total_mean
+    total_variance = ((variances + delta_means**2) * counts).sum(axis=0) / total_count
+    return {
+        "min": np.min(np.stack([s["min"] for s in stats_ft_list]), axis=0),
+        "max": np.max(np.stack([s["max"] for s in stats_ft_list]), axis=0),
+        "mean": total_mean,
+        "std": np.sqrt(total_variance),
+        "count": total_count,
+    }
+
+
+class TestAggregateStats(unittest.TestCase):
+    """Test the online (Chan) aggregation of per-episode stats."""
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        # Episodes of different lengths and offsets, so the mean correction matters
+        self.episodes = [rng.normal(i, 1.0 + i, size=(10 + 7 * i, 6)) for i in range(5)]
+        self.stats = [get_feature_stats(ep, axis=0, keepdims=False) for ep in self.episodes]
+
+    def test_matches_previous_implementation(self):
+        actual = aggregate_feature_stats(self.stats)
+        expected = reference_aggregate(self.stats)
+        for key in expected:
+            np.testing.assert_allclose(actual[key], expected[key], rtol=1e-10, err_msg=key)
+
+    def test_matches_stats_of_concatenated_data(self):
+        actual = aggregate_feature_stats(self.stats)
+        expected = get_feature_stats(np.concatenate(self.episodes), axis=0, keepdims=False)
+        for key in expected:
+            np.testing.assert_allclose(actual[key], expected[key], rtol=1e-10, err_msg=key)
+
+    def test_single_episode_is_unchanged(self):
+        actual = aggregate_feature_stats(self.stats[:1])
+        for key, value in self.stats[0].items():
+            np.testing.assert_allclose(actual[key], value, err_msg=key)
+
+    def test_image_stats(self):
+        rng = np.random.default_rng(4)
+        ep_stats = []
+        for n in (3, 8):
+            images = rng.integers(0, 256, size=(n, 3, 8, 8), dtype=np.uint8)
+            stats = get_image_stats(images)
+            ep_stats.append(
+                {"observation.images.top": {k: v if k == "count" else np.squeeze(v / 255.0, axis=0) for k, v in stats.items()}}
+            )
+        actual = aggregate_stats(ep_stats)["observation.images.top"]
+        expected = reference_aggregate([s["observation.images.top"] for s in ep_stats])
+        for key in expected:
+            self.assertEqual(actual[key].shape, expected[key].shape, key)
+            np.testing.assert_allclose(actual[key], expected[key], rtol=1e-10, err_msg=key)
+
+
+if __name__ == "__main__":
+    unittest.main()
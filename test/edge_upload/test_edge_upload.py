@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Unit tests for EdgeUploader command building and shard planning.
+
+Runs without an edge server: remote commands are executed by a local shell
+the same way sshd would run them.
+"""
+
+import io
+import os
+import shlex
+import subprocess
+import tarfile
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from operating_platform.core.edge_upload import EdgeConfig, EdgeUploader, EdgeUploadThread, run_edge_upload
+
+
+def remote_argv(uploader: EdgeUploader, ssh_cmd: list[str]) -> list[str]:
+    """The part of an ssh command line that is sent to the remote host"""
+    return ssh_cmd[ssh_cmd.index(uploader._userhost) + 1:]
+
+
+def run_like_sshd(remote: list[str]) -> subprocess.CompletedProcess:
+    """sshd joins the remote argv with spaces and hands it to the login shell"""
+    return subprocess.run(["sh", "-c", " ".join(remote)], capture_output=True, text=True)
+
+
+class TestSshShellCommand(unittest.TestCase):
+    """Test that shell scripts survive ssh's argv joining."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.uploader = EdgeUploader(EdgeConfig(remote_path=self.tmpdir.name, password=""))
+
+    def tearDown(self):
+        self.uploader._http.close()
+        self.tmpdir.cleanup()
+
+    def test_script_is_one_remote_word(self):
+        script = "mkdir -p '/a b' && echo SSH_OK"
+        remote = remote_argv(self.uploader, self.uploader._build_ssh_shell_cmd(script))
+        self.assertEqual(remote[:2], ["sh", "-c"])
+        self.assertEqual(len(remote), 3)
+        # What the remote login shell parses back out of the joined command line
+        self.assertEqual(shlex.split(" ".join(remote)), ["sh", "-c", script])
+
+    def test_prepare_remote_script_runs_remotely(self):
+        subpath = "user/repo"
+        target = Path(self.tmpdir.name) / subpath
+        script = f"mkdir -p '{target}' && df -Pk '{target}' | tail -1 && echo SSH_OK"
+
+        result = run_like_sshd(remote_argv(self.uploader, self.uploader._build_ssh_shell_cmd(script)))
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn("SSH_OK", result.stdout)
+        self.assertTrue(target.is_dir())
+
+
+class TestUploaderLifetime(unittest.TestCase):
+    """Test that uploaders never share SSH master connections."""
+
+    def test_control_paths_are_unique(self):
+        paths = set()
+        for _ in range(20):
+            # Dropped right away, so CPython is free to reuse the same id()
+            with EdgeUploader(EdgeConfig(password="")) as uploader:
+                paths.add(uploader._cm_path)
+        self.assertEqual(len(paths), 20)
+
+    def test_context_manager_closes(self):
+        with patch.object(EdgeUploader, "close") as close:
+            with EdgeUploader(EdgeConfig(password="")):
+                pass
+        close.assert_called_once()
+
+    def test_run_edge_upload_closes_uploader(self):
+        with patch.object(EdgeUploader, "test_connection", return_value=False), \
+                patch.object(EdgeUploader, "close") as close:
+            self.assertFalse(run_edge_upload("/tmp/dataset", "repo"))
+        close.assert_called_once()
+
+
+class TestRsyncFlags(unittest.TestCase):
+    """Test the rsync transfer flags."""
+
+    def test_summary_is_printed(self):
+        uploader = EdgeUploader(EdgeConfig(password="", rsync_stats=False))
+        try:
+            info = [f for f in uploader._rsync_transfer_flags() if f.startswith("--info=")]
+        finally:
+            uploader._http.close()
+        self.assertEqual(len(info), 1)
+        self.assertEqual(set(info[0][len("--info="):].split(",")), {"progress2", "stats1"})
+
+
+class TestRsyncShards(unittest.TestCase):
+    """Test how a dataset directory is split into rsync jobs."""
+
+    FILES = [
+        "meta/info.json",
+        "meta/episodes.jsonl",
+        "data/chunk-000/episode_000000.parquet",
+        "videos/chunk-000/observation.images.top/episode_000000.mp4",
+        "videos/chunk-000/observation.images.wrist/episode_000000.mp4",
+        "videos/chunk-001/observation.images.top/episode_001000.mp4",
+        "audio/chunk-000/observation.audio.mic/episode_000000.wav",
+        "images/observation.images.top/episode_000000/frame_000000.png",
+        "images/observation.images.wrist/episode_000000/frame_000000.png",
+        "README.md",
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        for rel in self.FILES:
+            path = self.root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"x")
+        self.uploader = EdgeUploader(EdgeConfig(password=""))
+
+    def tearDown(self):
+        self.uploader._http.close()
+        self.tmpdir.cleanup()
+
+    def test_shard_plan(self):
+        self.assertEqual(
+            self.uploader._rsync_shards(str(self.root)),
+            [
+                "audio/chunk-000/observation.audio.mic",
+                "data",
+                "images/observation.images.top",
+                "images/observation.images.wrist",
+                "meta",
+                "videos/chunk-000/observation.images.top",
+                "videos/chunk-000/observation.images.wrist",
+                "videos/chunk-001/observation.images.top",
+                "",
+            ],
+        )
+
+    def test_every_file_in_exactly_one_shard(self):
+        shards = self.uploader._rsync_shards(str(self.root))
+        for rel in self.FILES:
+            owners = [s for s in shards if (s and rel.startswith(s + "/")) or (not s and "/" not in rel)]
+            self.assertEqual(len(owners), 1, f"{rel}: {owners}")
+
+    def test_mixed_directory_is_not_split(self):
+        (self.root / "videos" / "chunk-000" / "stray.txt").write_bytes(b"x")
+        shards = self.uploader._rsync_shards(str(self.root))
+        self.assertIn("videos/chunk-000", shards)
+        self.assertIn("videos/chunk-001/observation.images.top", shards)
+        self.assertFalse(any(s.startswith("videos/chunk-000/") for s in shards))
+
+
+@patch("operating_platform.core.edge_upload.time.sleep", lambda s: None)
+class TestEdgeUploadThreadRetry(unittest.TestCase):
+    """Test per-step retries of EdgeUploadThread."""
+
+    def _upload(self, uploader: MagicMock, max_retries: int) -> bool:
+        thread = EdgeUploadThread(config=EdgeConfig(password=""), trigger_training=False, max_retries=max_retries)
+        with patch("operating_platform.core.edge_upload.EdgeUploader", return_value=uploader):
+            return thread._upload_with_retry("/tmp/dataset", "repo")
+
+    def test_max_retries_counts_retries(self):
+        uploader = MagicMock()
+        uploader.sync_dataset.return_value = False
+
+        self.assertFalse(self._upload(uploader, max_retries=2))
+        self.assertEqual(uploader.sync_dataset.call_count, 3)
+        uploader.notify_upload_complete.assert_not_called()
+
+    def test_notify_failure_does_not_resync(self):
+        uploader = MagicMock()
+        uploader.sync_dataset.return_value = True
+        uploader.notify_upload_complete.side_effect = [False, True]
+
+        self.assertTrue(self._upload(uploader, max_retries=3))
+        self.assertEqual(uploader.sync_dataset.call_count, 1)
+        self.assertEqual(uploader.notify_upload_complete.call_count, 2)
+        uploader.close.assert_called_once()
+
+
+class TestEdgeUploadThreadStatus(unittest.TestCase):
+    """Test that concurrent uploads keep their own status."""
+
+    def test_workers_do_not_overwrite_each_other(self):
+        both_syncing = threading.Barrier(2, timeout=5)
+
+        def sync_dataset(local_path, repo_id, progress_cb):
+            progress_cb(f"{repo_id} 50%")
+            both_syncing.wait()
+            return repo_id == "good"
+
+        uploader = MagicMock()
+        uploader.sync_dataset.side_effect = sync_dataset
+        uploader.notify_upload_complete.return_value = True
+
+        thread = EdgeUploadThread(config=EdgeConfig(password=""), trigger_training=False, max_workers=2, max_retries=0)
+        thread.submit("/tmp/good", "good")
+        thread.submit("/tmp/bad", "bad")
+        thread.close()
+        with patch("operating_platform.core.edge_upload.EdgeUploader", return_value=uploader):
+            thread.run()
+
+        jobs = thread.get_status()["jobs"]
+        self.assertEqual(jobs["good"], {"status": "UPLOADED", "progress": "good 50%", "error": None})
+        self.assertEqual(jobs["bad"], {"status": "FAILED", "progress": "bad 50%", "error": "Dataset sync failed"})
+        self.assertEqual(thread.current_status, "FAILED")
+        self.assertEqual(thread.error_message, "bad: Dataset sync failed")
+
+
+class TestEdgeUploadThreadFlush(unittest.TestCase):
+    """Test that flush() never waits on a thread that is not running."""
+
+    def test_flush_without_start_raises(self):
+        thread = EdgeUploadThread(config=EdgeConfig(password=""))
+        thread.submit("/tmp/dataset", "repo")
+        with self.assertRaises(RuntimeError):
+            thread.flush()
+
+    def test_flush_with_nothing_queued_returns(self):
+        EdgeUploadThread(config=EdgeConfig(password="")).flush()
+
+
+class TestHttpUpload(unittest.TestCase):
+    """Test the HTTP tar stream upload mode."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        (self.root / "meta").mkdir()
+        (self.root / "meta" / "info.json").write_text("{}")
+        self.config = EdgeConfig(password="", use_http_upload=True)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_upload_tar_stream_sends_dataset(self):
+        uploader = EdgeUploader(self.config)
+        received = {}
+
+        def post(url, data, **kwargs):
+            received["body"] = b"".join(data)
+            return MagicMock(status_code=200)
+
+        uploader._http.post = post
+        try:
+            self.assertTrue(uploader.upload_tar_stream(str(self.root), "repo"))
+        finally:
+            uploader.close()
+
+        with tarfile.open(fileobj=io.BytesIO(received["body"])) as tar:
+            self.assertIn("./meta/info.json", tar.getnames())
+
+    def test_http_mode_does_not_need_ssh(self):
+        thread = EdgeUploadThread(config=self.config, trigger_training=False)
+        thread.close()
+        with patch.object(EdgeUploader, "prepare_remote") as prepare_remote:
+            thread.run()
+        prepare_remote.assert_not_called()
+        self.assertEqual(thread.current_status, "COMPLETED")
+
+    def test_run_edge_upload_without_ssh(self):
+        posted = []
+
+        def post(self_, url, data=None, json=None, **kwargs):
+            if data is not None:
+                b"".join(data)  # drain the tar stream like a real upload
+            posted.append(url)
+            return MagicMock(status_code=200, json=lambda: {"message": "OK"})
+
+        env = {"EDGE_HTTP_UPLOAD": "1", "API_BASE_URL": "http://edge.test", "EDGE_SERVER_PASSWORD": ""}
+        with patch.dict(os.environ, env), \
+                patch.object(EdgeUploader, "_build_ssh_cmd", side_effect=AssertionError("SSH used")), \
+                patch("requests.Session.get", return_value=MagicMock(status_code=200)) as get, \
+                patch("requests.Session.post", post):
+            self.assertTrue(run_edge_upload(str(self.root), "repo", trigger_training=False))
+
+        self.assertEqual(get.call_args[0][0], "http://edge.test/health")
+        self.assertEqual(posted, ["http://edge.test/edge/upload/repo", "http://edge.test/edge/upload-complete"])
+
+
+class FakeClock:
+    """time.time / time.sleep replacement that only advances when asked"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTrainingStatusPolling(unittest.TestCase):
+    """Test long-polled get_status() and the poll_training_status() pacing."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.uploader = EdgeUploader(EdgeConfig(password=""))
+        self.uploader._http = MagicMock()
+        for name in ("time", "sleep"):
+            patcher = patch(f"operating_platform.core.edge_upload.time.{name}", getattr(self.clock, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _respond(self, status_code: int, body: dict = None, hold_s: float = 0.0):
+        def get(url, params=None, timeout=None):
+            self.clock.now += hold_s
+            return MagicMock(status_code=status_code, json=lambda: body, text="")
+
+        self.uploader._http.get.side_effect = get
+
+    def _poll(self, timeout_minutes: int = 1, poll_interval: int = 10):
+        return self.uploader.poll_training_status(
+            "repo", timeout_minutes=timeout_minutes, poll_interval=poll_interval, status_callback=lambda *_: None
+        )
+
+    def test_get_status_sends_etag(self):
+        self._respond(200, {"status": "TRAINING"})
+        self.assertEqual(self.uploader.get_status("repo", etag="UPLOADING"), {"status": "TRAINING"})
+        params = self.uploader._http.get.call_args.kwargs["params"]
+        self.assertEqual(params, {"wait_for_change": 1, "etag": "UPLOADING"})
+
+    def test_not_modified_keeps_status(self):
+        self._respond(304)
+        self.assertEqual(self.uploader.get_status("repo", etag="TRAINING"), {"status": "TRAINING"})
+
+    def test_not_modified_does_not_busy_loop(self):
+        self._respond(304)
+        self.assertEqual(self._poll(timeout_minutes=1, poll_interval=10), (False, None))
+        self.assertEqual(self.uploader._http.get.call_count, 6)
+        self.assertEqual(self.clock.sleeps, [10] * 6)
+
+    def test_timeout_is_honored(self):
+        self._respond(200, {"status": "TRAINING"})
+        start = self.clock.now
+        self.assertEqual(self._poll(timeout_minutes=1, poll_interval=100), (False, None))
+        self.assertEqual(self.clock.now - start, 60)
+
+    def test_server_ignoring_etag_falls_back_to_poll_interval(self):
+        self._respond(200, {"status": "TRAINING"})
+        self._poll(timeout_minutes=1, poll_interval=10)
+        # First answer is a change from "", every later one is paced
+        self.assertEqual(self.uploader._http.get.call_count, 7)
+        self.assertEqual(self.clock.sleeps, [10] * 6)
+
+    def test_long_poll_is_not_paced_again(self):
+        self._respond(304, hold_s=30)
+        self._poll(timeout_minutes=1, poll_interval=10)
+        self.assertEqual(self.uploader._http.get.call_count, 2)
+        self.assertEqual(self.clock.sleeps, [])
+
+
+class TestUploadManifest(unittest.TestCase):
+    """Test that the resume manifest never lands inside the dataset."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dataset = Path(self.tmpdir.name) / "dataset"
+        self.dataset.mkdir()
+        patcher = patch("operating_platform.core.edge_upload.UPLOAD_MANIFEST_DIR", Path(self.tmpdir.name) / "manifests")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_manifest_round_trip_outside_dataset(self):
+        shards = {"meta": {"files": 1, "bytes": 2, "mtime": 3.0}}
+        EdgeUploader._save_manifest(str(self.dataset), "/remote/user/repo", shards)
+
+        self.assertEqual(list(self.dataset.iterdir()), [])
+        self.assertEqual(EdgeUploader._load_manifest(str(self.dataset), "/remote/user/repo"), shards)
+        self.assertEqual(EdgeUploader._load_manifest(str(self.dataset), "/remote/other/repo"), {})
+
+        EdgeUploader._remove_manifest(str(self.dataset))
+        self.assertEqual(EdgeUploader._load_manifest(str(self.dataset), "/remote/user/repo"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
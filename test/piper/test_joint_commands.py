@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Piper v2 joint command conversion (rad -> 0.001 deg).
+
+Checks the vectorized conversion against the per-joint round() it replaced.
+Needs the node's runtime dependencies (dora, pyarrow, piper_sdk) to import.
+"""
+
+import importlib.util
+import math
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+MAIN_PATH = Path(__file__).resolve().parents[2] / "operating_platform/robot/components/arm_normal_piper_v2/main.py"
+spec = importlib.util.spec_from_file_location("arm_normal_piper_v2_main", MAIN_PATH)
+piper_main = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(piper_main)
+
+
+def reference_joints(position: np.ndarray) -> list[int]:
+    """Previous conversion: one round() per joint"""
+    factor = 1000 * 180 / np.pi  # Convert rad to 0.001 degrees
+    return [round(position[i] * factor) for i in range(6)]
+
+
+class TestJointCommands(unittest.TestCase):
+    """Test that joint commands are bit-identical to the previous path."""
+
+    def _check(self, dtype):
+        rng = np.random.default_rng(0)
+        actions = rng.uniform(-math.pi, math.pi, size=(20000, 7)).astype(dtype)
+        mismatches = [a for a in actions if piper_main.joint_commands(a) != reference_joints(a)]
+        self.assertEqual(mismatches, [])
+
+    def test_float32_actions(self):
+        self._check(np.float32)
+
+    def test_float64_actions(self):
+        self._check(np.float64)
+
+    def test_returns_python_ints(self):
+        joints = piper_main.joint_commands(np.array([0.5, -0.5, 0, 1, -1, 2, 0.01], dtype=np.float32))
+        self.assertEqual(len(joints), 6)
+        self.assertTrue(all(type(j) is int for j in joints))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Piper v1 image decode pool.
+
+Decodes are held back and released in a chosen order, so the test controls
+which worker finishes first.
+"""
+
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+# Add project root to path for imports
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from operating_platform.robot.robots.piper_v1 import manipulator
+
+EVENT_ID = "image_top"
+imdecode = cv2.imdecode  # the real decoder, before tests patch it
+
+
+def encode_frame(value: int) -> np.ndarray:
+    """PNG-encoded 4x4 frame filled with value"""
+    ok, buffer = cv2.imencode(".png", np.full((4, 4, 3), value, dtype=np.uint8))
+    assert ok
+    return buffer
+
+
+class GatedDecode:
+    """cv2.imdecode stand-in that waits until each frame is released"""
+
+    def __init__(self):
+        self.release = {}
+        self.done = {}
+
+    def add(self, value: int):
+        self.release[value] = threading.Event()
+        self.done[value] = threading.Event()
+
+    def __call__(self, buffer, flags):
+        frame = imdecode(buffer, flags)
+        value = int(frame[0, 0, 0])
+        self.release[value].wait(timeout=5)
+        return frame
+
+    def finish(self, value: int):
+        self.release[value].set()
+        self.done[value].wait(timeout=5)
+
+
+class TestDecodePool(unittest.TestCase):
+    """Test that out-of-order decodes never publish an older frame."""
+
+    def setUp(self):
+        manipulator._stop_decode_pool()
+        manipulator.recv_images.pop(EVENT_ID, None)
+        manipulator._start_decode_pool(2)
+        self.decode = GatedDecode()
+
+        real_publish = manipulator._decode_and_publish
+
+        def publish(event_id, seq, img_array):
+            value = int(imdecode(img_array, cv2.IMREAD_COLOR)[0, 0, 0])
+            try:
+                real_publish(event_id, seq, img_array)
+            finally:
+                self.decode.done[value].set()
+
+        patchers = [
+            patch.object(manipulator.cv2, "imdecode", self.decode),
+            patch.object(manipulator, "_decode_and_publish", publish),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(manipulator._stop_decode_pool)
+
+    def _submit(self, value: int):
+        self.decode.add(value)
+        manipulator._submit_decode(EVENT_ID, encode_frame(value))
+
+    def _published(self) -> int:
+        return int(manipulator.recv_images[EVENT_ID][0, 0, 0])
+
+    def test_newest_frame_wins_when_older_finishes_last(self):
+        self._submit(10)
+        self._submit(20)
+
+        self.decode.finish(20)
+        self.assertEqual(self._published(), 20)
+
+        self.decode.finish(10)
+        self.assertEqual(self._published(), 20)
+        self.assertEqual(manipulator._published_seq[EVENT_ID], 1)
+        self.assertEqual(manipulator._decode_inflight[EVENT_ID], 0)
+
+    def test_in_order_decodes_publish_each_frame(self):
+        self._submit(10)
+        self._submit(20)
+
+        self.decode.finish(10)
+        self.assertEqual(self._published(), 10)
+
+        self.decode.finish(20)
+        self.assertEqual(self._published(), 20)
+
+    def test_frames_beyond_inflight_limit_are_dropped(self):
+        self._submit(10)
+        self._submit(20)
+        manipulator._submit_decode(EVENT_ID, encode_frame(30))
+        self.assertEqual(manipulator._decode_seq[EVENT_ID], 1)
+
+        self.decode.finish(10)
+        self.decode.finish(20)
+        self.assertEqual(self._published(), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
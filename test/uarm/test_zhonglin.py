@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Zhonglin servo bus used by the UArm leader arm.
+
+Runs without hardware: the serial port is replaced by an in-memory fake
+that answers "#NNNPRAD!" queries like the servos do.
+"""
+
+import re
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# The UArm component imports its bundled `motors` package as top-level
+import sys
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "operating_platform/robot/components/arm_normal_uarm_v1"))
+
+from motors import Motor, MotorNormMode
+from motors.zhonglin import ZhonglinMotorsBus
+
+
+def make_bus(num_motors: int = 7) -> ZhonglinMotorsBus:
+    motors = {f"joint_{i + 1}": Motor(i, "zhonglin", MotorNormMode.DEGREES) for i in range(num_motors)}
+    return ZhonglinMotorsBus(port="/dev/null", motors=motors)
+
+
+def angle(pwm: int) -> float:
+    return (pwm - 500) / 2000 * 270
+
+
+class FakeSerial:
+    """Answers "#NNNPRAD!" queries with "#NNNPXXXX!" replies from a pwm table"""
+
+    def __init__(self, pwm: dict):
+        self.pwm = pwm  # servo id -> pwm; ids not in the table never answer
+        self.rx = bytearray()
+        self.writes = []
+
+    def write(self, data: bytes):
+        self.writes.append(data)
+        ids = [int(i) for i in re.findall(rb"#(\d{3})PRAD!", data)]
+        # Half-duplex single-wire bus: queued queries would collide with replies
+        if len(ids) == 1 and ids[0] in self.pwm:
+            self.rx += b"#%03dP%04d!" % (ids[0], self.pwm[ids[0]])
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.rx)
+
+    def read(self, size: int = 1) -> bytes:
+        data, self.rx = bytes(self.rx[:size]), self.rx[size:]
+        return data
+
+    def reset_input_buffer(self):
+        self.rx.clear()
+
+
+class TestReplyParsing(unittest.TestCase):
+    """Test pwm_to_angle against the previous str regex implementation."""
+
+    @staticmethod
+    def reference(response: bytes):
+        match = re.search(r"P(\d{4})", response.decode("ascii", errors="ignore"))
+        return None if match is None else angle(int(match.group(1)))
+
+    def test_matches_regex(self):
+        bus = make_bus()
+        for response in [
+            b"#000P1500!", b"#006P0500!", b"#003P2500!", b"#001P15", b"#001P15x0!",
+            b"#000PVER!#001P1234!", b"", b"garbage", b"P12345", b"\xff#002P0987!",
+        ]:
+            with self.subTest(response=response):
+                self.assertEqual(bus.pwm_to_angle(response), self.reference(response))
+
+
+class TestPositionRead(unittest.TestCase):
+    """Test reading all servo positions, one query/reply at a time."""
+
+    PWM = {i: 600 + 250 * i for i in range(7)}
+
+    def _bus(self, ser: FakeSerial) -> ZhonglinMotorsBus:
+        bus = make_bus()
+        bus.ser = ser  # _fd stays None, so the pyserial fallback path is used
+        return bus
+
+    def test_one_query_per_write(self):
+        ser = FakeSerial(self.PWM)
+        values = self._bus(ser).sync_read("Present_Position")
+        self.assertEqual(ser.writes, [b"#%03dPRAD!" % i for i in range(7)])
+        self.assertEqual(values, {f"joint_{i + 1}": angle(self.PWM[i]) for i in range(7)})
+
+    def test_array_read_is_ordered_like_motors(self):
+        np.testing.assert_allclose(
+            self._bus(FakeSerial(self.PWM)).sync_read_array(), [angle(self.PWM[i]) for i in range(7)], rtol=1e-6
+        )
+
+    def test_stale_input_is_discarded(self):
+        ser = FakeSerial(self.PWM)
+        ser.rx += b"#000P2500!"
+        values = self._bus(ser).sync_read("Present_Position", ["joint_2"])
+        self.assertEqual(values, {"joint_2": angle(self.PWM[1])})
+
+    def test_silent_servo_reads_zero_and_is_counted(self):
+        pwm = dict(self.PWM)
+        del pwm[5]
+        bus = self._bus(FakeSerial(pwm))
+        values = bus.sync_read("Present_Position", ["joint_5", "joint_6"])
+        self.assertEqual(values, {"joint_5": angle(self.PWM[4]), "joint_6": 0.0})
+        bus.sync_read("Present_Position", ["joint_6"])
+        self.assertEqual(bus.read_misses, 2)
+
+
+class TestBackgroundRead(unittest.TestCase):
+    """Test the background position poller."""
+
+    def setUp(self):
+        self.bus = make_bus()
+
+    def tearDown(self):
+        self.bus.stop_background_read()
+
+    def test_latest_positions_waits_for_first_poll(self):
+        def slow_read(names, out):
+            time.sleep(0.3)
+            out[:] = np.arange(1, len(names) + 1)
+
+        self.bus._read_positions = slow_read
+        self.bus.start_background_read()
+
+        np.testing.assert_array_equal(self.bus.latest_positions(), np.arange(1, 8, dtype=np.float32))
+
+    def test_reader_error_is_raised(self):
+        def broken_read(names, out):
+            raise ValueError("bad reply")
+
+        self.bus._read_positions = broken_read
+        self.bus.start_background_read()
+
+        with self.assertRaises(ValueError):
+            self.bus.latest_positions()
+
+    def test_positions_not_served_after_reader_dies(self):
+        first_done = threading.Event()
+
+        def read_once(names, out):
+            if first_done.is_set():
+                raise ValueError("bad reply")
+            out[:] = 1.0
+            first_done.set()
+            time.sleep(0.2)
+
+        self.bus._read_positions = read_once
+        self.bus.start_background_read()
+        np.testing.assert_array_equal(self.bus.latest_positions(), np.ones(7, dtype=np.float32))
+
+        self.bus._reader.join(timeout=1.0)
+        with self.assertRaises(ValueError):
+            self.bus.latest_positions()
+
+    def test_persistent_serial_errors_stop_the_reader(self):
+        def unplugged(names, out):
+            raise OSError("device disconnected")
+
+        self.bus._read_positions = unplugged
+        self.bus._stop_reader.wait = lambda timeout=None: False  # no backoff delay
+        self.bus.start_background_read()
+
+        with self.assertRaises(OSError):
+            self.bus.latest_positions()
+
+
+class ExchangeCheckingSerial(FakeSerial):
+    """Records an error whenever two query/reply exchanges overlap on the bus"""
+
+    def __init__(self, pwm: dict):
+        super().__init__(pwm)
+        self.owner = None
+        self.overlaps = 0
+        self._lock = threading.Lock()
+
+    def reset_input_buffer(self):
+        # Every exchange starts here and ends with the '!' of its reply
+        with self._lock:
+            if self.owner is not None:
+                self.overlaps += 1
+            self.owner = threading.get_ident()
+        super().reset_input_buffer()
+        time.sleep(0.0005)  # widen the window for a concurrent exchange
+
+    def read(self, size: int = 1) -> bytes:
+        data = super().read(size)
+        if data.endswith(b"!"):
+            with self._lock:
+                self.owner = None
+        return data
+
+
+class TestBusSharing(unittest.TestCase):
+    """Test that the background reader paces itself and shares the bus."""
+
+    PWM = {i: 1500 for i in range(7)}
+
+    def test_reads_are_paced(self):
+        bus = make_bus()
+        reads = []
+        bus._read_positions = lambda names, out: reads.append(time.monotonic())
+        bus.start_background_read(period_s=0.1)
+        time.sleep(0.35)
+        bus.stop_background_read()
+        self.assertLessEqual(len(reads), 5)
+        self.assertTrue(all(b - a >= 0.09 for a, b in zip(reads, reads[1:])))
+
+    def test_commands_do_not_interleave_with_reader(self):
+        bus = make_bus()
+        bus.ser = ExchangeCheckingSerial(self.PWM)
+        bus.start_background_read(period_s=0.0)
+        try:
+            for _ in range(200):
+                bus.send_command("#000PRAD!")
+        finally:
+            bus.stop_background_read()
+        self.assertEqual(bus.ser.overlaps, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()